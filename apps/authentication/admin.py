@@ -1,5 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.db.models import BooleanField, Case, Value, When
+from django.db.models.functions import Now
 from .models import User, MagicLink, UserSession, PhoneVerification
 
 
@@ -31,14 +33,24 @@ class UserAdmin(BaseUserAdmin):
 class MagicLinkAdmin(admin.ModelAdmin):
     list_display = ['email', 'user', 'is_used', 'created_at', 'expires_at', 'is_valid_display']
     list_filter = ['is_used', 'created_at']
-    search_fields = ['email', 'user__email', 'token']
+    search_fields = ['email', 'user__email']
     readonly_fields = ['token', 'created_at', 'used_at']
     ordering = ['-created_at']
+    list_select_related = ['user']
 
+    def get_queryset(self, request):
+        # Compute validity in SQL so the changelist renders straight from the page query
+        return super().get_queryset(request).annotate(
+            _is_valid=Case(
+                When(is_used=False, expires_at__gt=Now(), then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField(),
+            )
+        )
+
+    @admin.display(boolean=True, description='Valid', ordering='_is_valid')
     def is_valid_display(self, obj):
-        return obj.is_valid()
-    is_valid_display.boolean = True
-    is_valid_display.short_description = 'Valid'
+        return obj._is_valid
 
 
 @admin.register(UserSession)
@@ -48,6 +60,7 @@ class UserSessionAdmin(admin.ModelAdmin):
     search_fields = ['user__email', 'ip_address']
     readonly_fields = ['token', 'created_at', 'last_activity']
     ordering = ['-last_activity']
+    list_select_related = ['user']
 
 
 @admin.register(PhoneVerification)
@@ -57,6 +70,7 @@ class PhoneVerificationAdmin(admin.ModelAdmin):
     search_fields = ['phone_number', 'user__email', 'verification_code']
     readonly_fields = ['verification_code', 'created_at', 'verified_at', 'attempts']
     ordering = ['-created_at']
+    list_select_related = ['user']
     
     fieldsets = (
         (None, {
@@ -0,0 +1,55 @@
+"""
+Django management command to expire stale authentication records in bulk.
+
+Deletes expired magic links and phone verifications and deactivates expired
+sessions with single SQL statements, instead of letting every request pay
+for scanning stale rows. Intended to run periodically (e.g. cron every
+15 minutes).
+
+Usage:
+    python manage.py expire_auth_tokens
+"""
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from apps.authentication.models import MagicLink, UserSession, PhoneVerification
+
+
+class Command(BaseCommand):
+    help = 'Expire stale magic links, user sessions and phone verifications in bulk'
+
+    # Cap each batch so the sweep never holds long locks on large tables
+    BATCH_SIZE = 10000
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+
+        deleted_links = 0
+        while True:
+            batch = MagicLink.objects.filter(expires_at__lt=now).values_list('pk', flat=True)[:self.BATCH_SIZE]
+            count, _ = MagicLink.objects.filter(pk__in=list(batch)).delete()
+            deleted_links += count
+            if count < self.BATCH_SIZE:
+                break
+
+        deactivated_sessions = UserSession.objects.filter(
+            expires_at__lt=now,
+            is_active=True
+        ).update(is_active=False)
+
+        deleted_verifications = 0
+        while True:
+            batch = PhoneVerification.objects.filter(
+                expires_at__lt=now,
+                is_verified=False
+            ).values_list('pk', flat=True)[:self.BATCH_SIZE]
+            count, _ = PhoneVerification.objects.filter(pk__in=list(batch)).delete()
+            deleted_verifications += count
+            if count < self.BATCH_SIZE:
+                break
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Expired {deleted_links} magic links, '
+            f'deactivated {deactivated_sessions} sessions, '
+            f'deleted {deleted_verifications} phone verifications.'
+        ))
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-08-31 02:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0004_add_is_phone_verified'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='magiclink',
+            index=models.Index(fields=['-created_at'], name='magic_links_created_892e96_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='magiclink',
+            index=models.Index(fields=['is_used', 'expires_at'], name='magic_links_is_used_fd33a5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='magiclink',
+            index=models.Index(fields=['email', 'is_used'], name='magic_links_email_25f1e3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='phoneverification',
+            index=models.Index(fields=['phone_number', 'is_verified'], name='phone_verif_phone_n_baa12f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='phoneverification',
+            index=models.Index(fields=['expires_at'], name='phone_verif_expires_efa46d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usersession',
+            index=models.Index(fields=['user', 'is_active', '-last_activity'], name='user_sessio_user_id_9c4311_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usersession',
+            index=models.Index(fields=['expires_at'], name='user_sessio_expires_66ae96_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-08-31 02:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0005_add_auth_hot_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='phone',
+            field=models.CharField(blank=True, db_index=True, max_length=20),
+        ),
+    ]
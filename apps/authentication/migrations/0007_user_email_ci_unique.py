@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-08-31 02:44
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0006_user_phone_db_index'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Upper('email'), name='users_email_upper_uq'),
+        ),
+    ]
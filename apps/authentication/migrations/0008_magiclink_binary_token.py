@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-08-31 02:45
+
+from django.db import migrations, models
+
+
+def purge_magic_links(apps, schema_editor):
+    """Drop existing rows; text tokens can't be carried into the binary column
+    and magic links expire within 15 minutes anyway."""
+    MagicLink = apps.get_model('authentication', 'MagicLink')
+    MagicLink.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0007_user_email_ci_unique'),
+    ]
+
+    operations = [
+        migrations.RunPython(purge_magic_links, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='magiclink',
+            name='token',
+        ),
+        migrations.AddField(
+            model_name='magiclink',
+            name='token',
+            field=models.BinaryField(default=b'', max_length=32, unique=True),
+            preserve_default=False,
+        ),
+    ]
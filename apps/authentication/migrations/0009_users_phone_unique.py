@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-08-31 02:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0008_magiclink_binary_token'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(condition=models.Q(('phone', ''), _negated=True), fields=('phone',), name='users_phone_uq'),
+        ),
+    ]
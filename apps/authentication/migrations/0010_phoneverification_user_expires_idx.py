@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-08-31 02:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0009_users_phone_unique'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='phoneverification',
+            index=models.Index(fields=['user', 'expires_at'], name='phone_verif_user_id_a7a2c6_idx'),
+        ),
+    ]
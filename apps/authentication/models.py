@@ -1,9 +1,11 @@
+import base64
+import hmac
+import secrets
+
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils import timezone
-import secrets
-import random
-import string
 
 
 class UserManager(BaseUserManager):
@@ -46,7 +48,7 @@ class User(AbstractBaseUser, PermissionsMixin):
     last_login = models.DateTimeField(null=True, blank=True)
 
     # Profile fields
-    phone = models.CharField(max_length=20, blank=True)
+    phone = models.CharField(max_length=20, blank=True, db_index=True)
     is_phone_verified = models.BooleanField(default=False)
     avatar = models.ImageField(upload_to='avatars/', null=True, blank=True)
     language = models.CharField(max_length=10, default='en')
@@ -60,6 +62,18 @@ class User(AbstractBaseUser, PermissionsMixin):
         db_table = 'users'
         verbose_name = 'User'
         verbose_name_plural = 'Users'
+        constraints = [
+            # Upper() matches the SQL Django generates for email__iexact,
+            # so case-insensitive probes use this index
+            models.UniqueConstraint(Upper('email'), name='users_email_upper_uq'),
+            # One account per phone number, enforced by the DB so hot paths
+            # don't need an existence probe first
+            models.UniqueConstraint(
+                fields=['phone'],
+                condition=~models.Q(phone=''),
+                name='users_phone_uq',
+            ),
+        ]
 
     def __str__(self):
         return self.email
@@ -75,7 +89,9 @@ class MagicLink(models.Model):
     """Magic link tokens for passwordless authentication."""
 
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='magic_links')
-    token = models.CharField(max_length=100, unique=True, db_index=True)
+    # Raw 32 random bytes; indexed as fixed-length binary instead of the
+    # ~43-char base64 text form. Use token_str / decode_token at the edges.
+    token = models.BinaryField(max_length=32, unique=True)
     email = models.EmailField()
     created_at = models.DateTimeField(auto_now_add=True)
     expires_at = models.DateTimeField()
@@ -89,6 +105,11 @@ class MagicLink(models.Model):
         verbose_name = 'Magic Link'
         verbose_name_plural = 'Magic Links'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at']),
+            models.Index(fields=['is_used', 'expires_at']),
+            models.Index(fields=['email', 'is_used']),
+        ]
 
     def __str__(self):
         return f"Magic Link for {self.email} - {'Used' if self.is_used else 'Active'}"
@@ -96,7 +117,48 @@ class MagicLink(models.Model):
     @staticmethod
     def generate_token():
         """Generate a secure random token."""
-        return secrets.token_urlsafe(32)
+        return secrets.token_bytes(32)
+
+    @staticmethod
+    def decode_token(value):
+        """Decode a url-safe token string back to raw bytes; None if malformed."""
+        try:
+            return base64.urlsafe_b64decode(value + '=' * (-len(value) % 4))
+        except (ValueError, TypeError):
+            return None
+
+    @property
+    def token_str(self):
+        """Url-safe string form of the token for links and payloads."""
+        return base64.urlsafe_b64encode(bytes(self.token)).rstrip(b'=').decode()
+
+    @classmethod
+    def create_with_token(cls, user, expires_at, **fields):
+        """
+        Insert a magic link with a freshly generated token in a single INSERT.
+
+        Relies on the unique constraint instead of a SELECT-then-INSERT probe,
+        regenerating the token on the (vanishingly unlikely) collision.
+        bulk_create skips pre_save/post_save signal dispatch and the model
+        refresh that objects.create pays on every call.
+        """
+        from django.db import IntegrityError
+
+        last_error = None
+        for _ in range(3):
+            link = cls(
+                user=user,
+                email=user.email,
+                token=cls.generate_token(),
+                expires_at=expires_at,
+                **fields
+            )
+            try:
+                cls.objects.bulk_create([link])
+                return link
+            except IntegrityError as e:
+                last_error = e
+        raise last_error
 
     def is_valid(self):
         """Check if the magic link is still valid."""
@@ -110,7 +172,7 @@ class MagicLink(models.Model):
         """Mark the magic link as used."""
         self.is_used = True
         self.used_at = timezone.now()
-        self.save()
+        self.save(update_fields=['is_used', 'used_at'])
 
 
 class UserSession(models.Model):
@@ -133,6 +195,10 @@ class UserSession(models.Model):
         verbose_name = 'User Session'
         verbose_name_plural = 'User Sessions'
         ordering = ['-last_activity']
+        indexes = [
+            models.Index(fields=['user', 'is_active', '-last_activity']),
+            models.Index(fields=['expires_at']),
+        ]
 
     def __str__(self):
         return f"{self.user.email} - {self.device_type} - {self.created_at}"
@@ -164,14 +230,19 @@ class PhoneVerification(models.Model):
         verbose_name = 'Phone Verification'
         verbose_name_plural = 'Phone Verifications'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['phone_number', 'is_verified']),
+            models.Index(fields=['expires_at']),
+            models.Index(fields=['user', 'expires_at']),
+        ]
     
     def __str__(self):
         return f"Phone verification for {self.phone_number} - {'Verified' if self.is_verified else 'Pending'}"
     
     @staticmethod
     def generate_verification_code():
-        """Generate a 6-digit verification code."""
-        return ''.join(random.choices(string.digits, k=6))
+        """Generate a cryptographically secure 6-digit verification code."""
+        return f"{secrets.randbelow(1000000):06d}"
     
     def is_valid(self):
         """Check if the verification code is still valid."""
@@ -188,18 +259,19 @@ class PhoneVerification(models.Model):
         if not self.is_valid():
             return False
         
-        if self.verification_code == code:
+        if hmac.compare_digest(str(self.verification_code), str(code)):
             self.is_verified = True
             self.verified_at = timezone.now()
-            self.save()
+            self.save(update_fields=['is_verified', 'verified_at'])
             return True
         else:
+            # Atomic increment avoids read-modify-write races between attempts
+            PhoneVerification.objects.filter(pk=self.pk).update(attempts=models.F('attempts') + 1)
             self.attempts += 1
-            self.save()
             return False
     
     def mark_as_verified(self):
         """Mark the phone number as verified."""
         self.is_verified = True
         self.verified_at = timezone.now()
-        self.save()
+        self.save(update_fields=['is_verified', 'verified_at'])
@@ -2,12 +2,26 @@
 Authentication app serializers
 Handles user registration, login, and profile serialization
 """
+import re
+
 from rest_framework import serializers
 from django.contrib.auth import get_user_model, authenticate
+from django.db import IntegrityError
 from .models import MagicLink, UserSession, PhoneVerification
 
 User = get_user_model()
 
+# Precompiled once at import time; validate_phone_number runs on every request
+PHONE_CLEANUP_RE = re.compile(r'[^\d+]')
+NON_DIGIT_RE = re.compile(r'[^\d]')
+
+
+class NormalizedEmailField(serializers.EmailField):
+    """Email field that lowercases once during deserialization"""
+
+    def to_internal_value(self, data):
+        return super().to_internal_value(data).lower()
+
 
 class UserSerializer(serializers.ModelSerializer):
     """
@@ -16,29 +30,62 @@ class UserSerializer(serializers.ModelSerializer):
     """
     has_instances = serializers.SerializerMethodField()
     instances = serializers.SerializerMethodField()
-    
+    instances_count = serializers.SerializerMethodField()
+
+    # Cap the inline instance list; clients needing more should page the
+    # instances endpoint instead of inflating every auth response
+    MAX_INLINE_INSTANCES = 25
+
     class Meta:
         model = User
         fields = [
             'id', 'email', 'name', 'phone', 'is_phone_verified', 'avatar',
             'language', 'is_active', 'is_staff', 'is_superuser',
-            'date_joined', 'last_login', 'has_instances', 'instances'
+            'date_joined', 'last_login', 'has_instances', 'instances', 'instances_count'
+        ]
+        read_only_fields = [
+            'id', 'is_staff', 'is_superuser', 'date_joined', 'last_login',
+            'has_instances', 'instances', 'instances_count'
         ]
-        read_only_fields = ['id', 'is_staff', 'is_superuser', 'date_joined', 'last_login', 'has_instances', 'instances']
     
+    def _get_active_memberships(self, obj):
+        """Get active memberships, reusing the prefetched list when available"""
+        memberships = getattr(obj, '_active_memberships', None)
+        if memberships is None:
+            from apps.instances.models import InstanceMember
+            memberships = list(
+                InstanceMember.objects.filter(user=obj, is_active=True).select_related('instance')
+            )
+            # Cache on the instance so has_instances/instances share one query
+            obj._active_memberships = memberships
+        return memberships
+
     def get_has_instances(self, obj):
         """Check if user has any instances (completed onboarding)"""
-        return obj.instance_memberships.filter(is_active=True).exists()
-    
+        return bool(self._get_active_memberships(obj))
+
     def get_instances(self, obj):
-        """Get user's instances with minimal data"""
-        from apps.instances.models import InstanceMember
-        memberships = InstanceMember.objects.filter(user=obj, is_active=True).select_related('instance')
+        """Get user's instances with minimal data, capped at MAX_INLINE_INSTANCES"""
         return [{
             'id': str(m.instance.id),
             'name': m.instance.name,
             'role': m.role
-        } for m in memberships]
+        } for m in self._get_active_memberships(obj)[:self.MAX_INLINE_INSTANCES]]
+
+    def get_instances_count(self, obj):
+        """Total number of active memberships (instances may be truncated)"""
+        return len(self._get_active_memberships(obj))
+
+
+class UserBriefSerializer(serializers.ModelSerializer):
+    """
+    Minimal user serializer for nesting in other payloads
+    Avoids the instance-membership lookups of the full UserSerializer
+    """
+    class Meta:
+        model = User
+        fields = ['id', 'email', 'name', 'avatar']
+        read_only_fields = fields
 
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
@@ -46,32 +93,40 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
     Serializer for user registration
     Validates email uniqueness and creates new users
     """
+    email = NormalizedEmailField()
     password = serializers.CharField(write_only=True, required=True, min_length=6)
 
     class Meta:
         model = User
         fields = ['email', 'name', 'phone', 'language', 'password']
 
-    def validate_email(self, value):
-        """Ensure email is unique"""
-        if User.objects.filter(email=value.lower()).exists():
-            raise serializers.ValidationError("A user with this email already exists.")
-        return value.lower()
-
     def validate_phone(self, value):
-        """Clean and validate phone number"""
+        """Remove all spaces from phone number"""
         if value:
-            # Remove all spaces from phone number
-            cleaned_phone = value.replace(' ', '')
-            # Check if phone number is unique
-            if User.objects.filter(phone=cleaned_phone).exists():
-                raise serializers.ValidationError("A user with this phone number already exists.")
-            return cleaned_phone
+            return value.replace(' ', '')
         return value
 
+    def validate(self, data):
+        """Check email and phone uniqueness with a single query"""
+        from django.db.models import Q
+
+        email = data.get('email')
+        phone = data.get('phone')
+
+        uniqueness_filter = Q(email__iexact=email)
+        if phone:
+            uniqueness_filter |= Q(phone=phone)
+
+        existing = User.objects.filter(uniqueness_filter).values_list('email', 'phone').first()
+        if existing:
+            if existing[0].lower() == email:
+                raise serializers.ValidationError({'email': "A user with this email already exists."})
+            raise serializers.ValidationError({'phone': "A user with this phone number already exists."})
+
+        return data
+
     def create(self, validated_data):
         """Create new user with hashed password"""
-        validated_data['email'] = validated_data['email'].lower()
         password = validated_data.pop('password')
         user = User.objects.create_user(
             password=password,
@@ -84,12 +139,12 @@ class LoginSerializer(serializers.Serializer):
     """
     Serializer for password-based login
     """
-    email = serializers.EmailField()
+    email = NormalizedEmailField()
     password = serializers.CharField(write_only=True)
 
     def validate(self, data):
         """Validate credentials"""
-        email = data.get('email', '').lower()
+        email = data.get('email', '')
         password = data.get('password', '')
 
         if not email or not password:
@@ -113,15 +168,18 @@ class MagicLinkRequestSerializer(serializers.Serializer):
     Serializer for requesting a magic link
     Used when user wants to log in
     """
-    email = serializers.EmailField()
+    email = NormalizedEmailField()
 
     def validate_email(self, value):
         """Ensure email exists in the system"""
-        if not User.objects.filter(email=value.lower()).exists():
+        user = User.objects.filter(email__iexact=value).only('id', 'email', 'is_active').first()
+        if user is None:
             raise serializers.ValidationError(
                 "No account found with this email address. Please register first."
             )
-        return value.lower()
+        # Stash the user so the view doesn't need to re-query
+        self.context['user'] = user
+        return value
 
 
 class MagicLinkVerifySerializer(serializers.Serializer):
@@ -132,15 +190,26 @@ class MagicLinkVerifySerializer(serializers.Serializer):
     token = serializers.CharField(max_length=100)
 
     def validate_token(self, value):
-        """Verify the magic link token is valid"""
-        try:
-            magic_link = MagicLink.objects.get(token=value)
-        except MagicLink.DoesNotExist:
+        """Verify the magic link token is valid with a single indexed query"""
+        from django.utils import timezone
+
+        raw_token = MagicLink.decode_token(value)
+        if raw_token is None:
             raise serializers.ValidationError("Invalid or expired token.")
 
-        if not magic_link.is_valid():
-            raise serializers.ValidationError("This token has expired or has already been used.")
+        # select_related pulls the user in the same query; the view touches
+        # magic_link.user several times (tokens, session row, response body)
+        magic_link = MagicLink.objects.select_related('user').filter(
+            token=raw_token,
+            is_used=False,
+            expires_at__gt=timezone.now()
+        ).first()
+
+        if magic_link is None:
+            raise serializers.ValidationError("Invalid or expired token.")
 
+        # Stash the instance so the view doesn't need to re-query
+        self.context['magic_link'] = magic_link
         return value
 
 
@@ -149,7 +218,7 @@ class UserSessionSerializer(serializers.ModelSerializer):
     Serializer for user sessions
     Used to track active sessions
     """
-    user = UserSerializer(read_only=True)
+    user = UserBriefSerializer(read_only=True)
 
     class Meta:
         model = UserSession
@@ -170,11 +239,34 @@ class UserProfileUpdateSerializer(serializers.ModelSerializer):
         model = User
         fields = ['name', 'phone', 'avatar', 'language']
 
+    def validate_phone(self, value):
+        """Reject phone numbers already claimed by another account"""
+        if value and User.objects.exclude(pk=self.instance.pk).filter(phone=value).exists():
+            raise serializers.ValidationError(
+                'Phone number is already registered with another account.'
+            )
+        return value
+
     def update(self, instance, validated_data):
-        """Update user profile"""
+        """Update only the submitted fields instead of rewriting the full row"""
+        if not validated_data:
+            return instance
+
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save()
+
+        # The users_phone_uq constraint can still fire if another account
+        # claims the phone between validation and the write
+        try:
+            if 'avatar' in validated_data:
+                # ImageField uploads are persisted by storage during save()
+                instance.save(update_fields=list(validated_data))
+            else:
+                User.objects.filter(pk=instance.pk).update(**validated_data)
+        except IntegrityError:
+            raise serializers.ValidationError({
+                'phone': 'Phone number is already registered with another account.'
+            })
         return instance
 
 
@@ -186,19 +278,18 @@ class PhoneVerificationRequestSerializer(serializers.Serializer):
     
     def validate_phone_number(self, value):
         """Validate and normalize phone number"""
-        import re
         # Remove all spaces first, then remove all non-digit characters except +
-        cleaned = re.sub(r'[^\d+]', '', value.replace(' ', ''))
-        
+        cleaned = PHONE_CLEANUP_RE.sub('', value.replace(' ', ''))
+
         # If it doesn't start with +, add it
         if not cleaned.startswith('+'):
             cleaned = '+' + cleaned
-        
+
         # Basic validation - should have at least 10 digits
-        digits_only = re.sub(r'[^\d]', '', cleaned)
+        digits_only = NON_DIGIT_RE.sub('', cleaned)
         if len(digits_only) < 10:
             raise serializers.ValidationError("Please enter a valid phone number with country code.")
-        
+
         return cleaned
 
 
@@ -2,15 +2,263 @@
 Services for authentication including phone verification and email sending.
 """
 
+import logging
 import re
+import threading
 from datetime import timedelta
+from functools import lru_cache
+
+import httpx
 from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
 from django.utils import timezone
+from twilio.http.http_client import TwilioHttpClient
 from twilio.rest import Client
 from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import Mail
 from .models import PhoneVerification, User
 
+logger = logging.getLogger(__name__)
+
+# Deletion table keeping only digits and '+'; str.translate is a single C
+# pass over the string, cheaper than the regex engine for short phone inputs.
+# Non-ASCII characters are stripped by the regex fallback below.
+_PHONE_KEEP = frozenset('0123456789+')
+_PHONE_STRIP_TABLE = str.maketrans('', '', ''.join(
+    chr(c) for c in range(128) if chr(c) not in _PHONE_KEEP
+))
+_PHONE_STRIP_RE = re.compile(r'[^\d+]')
+
+# Fast-path match for numbers already in E.164 form (the stored format)
+_E164_RE = re.compile(r'\+\d{6,15}')
+
+# SMS body segments; joined around the code so bulk sends skip re-formatting
+_SMS_PRE = "Your VEOmenu verification code is: "
+_SMS_POST = ". This code expires in 10 minutes."
+
+# Cache TTL matches the 10-minute verification code expiry
+VERIFICATION_CACHE_TTL = 600
+
+# Verification attempts allowed per user per minute before short-circuiting
+VERIFY_RATE_LIMIT_PER_MINUTE = 5
+
+# Provider clients are shared per process so worker threads reuse one
+# keep-alive connection pool instead of paying a TCP+TLS handshake per request
+_client_lock = threading.Lock()
+_twilio_client = None
+_sendgrid_client = None
+
+
+def _get_twilio_client():
+    global _twilio_client
+    if _twilio_client is None:
+        with _client_lock:
+            if _twilio_client is None:
+                _twilio_client = Client(
+                    settings.TWILIO_ACCOUNT_SID,
+                    settings.TWILIO_AUTH_TOKEN,
+                    # Bound a hung provider connection instead of inheriting
+                    # the SDK's unlimited default
+                    http_client=TwilioHttpClient(timeout=10.0),
+                )
+    return _twilio_client
+
+
+def _get_sendgrid_client():
+    global _sendgrid_client
+    if _sendgrid_client is None:
+        with _client_lock:
+            if _sendgrid_client is None:
+                _sendgrid_client = SendGridAPIClient(api_key=settings.SENDGRID_API_KEY)
+    return _sendgrid_client
+
+
+# Shared async HTTP client for ASGI deployments; provider SDK calls would
+# otherwise pin a worker thread for the full round-trip
+_async_http = httpx.AsyncClient(
+    timeout=httpx.Timeout(10.0, connect=5.0),
+    limits=httpx.Limits(max_keepalive_connections=50),
+)
+
+_SENDGRID_SEND_URL = 'https://api.sendgrid.com/v3/mail/send'
+_TWILIO_MESSAGES_URL = 'https://api.twilio.com/2010-04-01/Accounts/{sid}/Messages.json'
+
+
+def _verification_cache_key(user_id):
+    return f'phoneverif:{user_id}'
+
+
+def _phone_owner_cache_key(phone_number):
+    return f'phone_owner:{phone_number}'
+
+
+# Built once at import; only {user_name} varies per send
+_WELCOME_EMAIL_TEMPLATE = """
+        <!DOCTYPE html>
+        <html lang="en">
+        <head>
+            <meta charset="UTF-8">
+            <meta name="viewport" content="width=device-width, initial-scale=1.0">
+            <title>Welcome to VEOmenu</title>
+            <style>
+                body {{
+                    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+                    line-height: 1.6;
+                    color: #333;
+                    max-width: 600px;
+                    margin: 0 auto;
+                    padding: 20px;
+                    background-color: #f8f9fa;
+                }}
+                .container {{
+                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                    border-radius: 12px;
+                    padding: 40px;
+                    color: white;
+                    text-align: center;
+                }}
+                .logo {{
+                    font-size: 32px;
+                    font-weight: bold;
+                    margin-bottom: 20px;
+                    text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
+                }}
+                .welcome-title {{
+                    font-size: 28px;
+                    margin-bottom: 20px;
+                    color: #fff;
+                }}
+                .welcome-message {{
+                    font-size: 18px;
+                    margin-bottom: 30px;
+                    opacity: 0.9;
+                }}
+                .features {{
+                    background: rgba(255,255,255,0.1);
+                    border-radius: 8px;
+                    padding: 30px;
+                    margin: 30px 0;
+                    backdrop-filter: blur(10px);
+                }}
+                .feature-item {{
+                    display: flex;
+                    align-items: center;
+                    margin: 15px 0;
+                    font-size: 16px;
+                }}
+                .feature-icon {{
+                    font-size: 24px;
+                    margin-right: 15px;
+                    width: 30px;
+                }}
+                .cta-button {{
+                    display: inline-block;
+                    background: linear-gradient(45deg, #ff6b6b, #ee5a24);
+                    color: white;
+                    padding: 15px 30px;
+                    text-decoration: none;
+                    border-radius: 25px;
+                    font-weight: bold;
+                    font-size: 18px;
+                    margin: 20px 0;
+                    box-shadow: 0 4px 15px rgba(255, 107, 107, 0.3);
+                    transition: transform 0.3s ease;
+                }}
+                .cta-button:hover {{
+                    transform: translateY(-2px);
+                }}
+                .footer {{
+                    margin-top: 40px;
+                    padding-top: 20px;
+                    border-top: 1px solid rgba(255,255,255,0.2);
+                    font-size: 14px;
+                    opacity: 0.8;
+                }}
+                .social-links {{
+                    margin: 20px 0;
+                }}
+                .social-links a {{
+                    color: white;
+                    text-decoration: none;
+                    margin: 0 10px;
+                    font-size: 18px;
+                }}
+            </style>
+        </head>
+        <body>
+            <div class="container">
+                <div class="logo">🍽️ VEOmenu</div>
+                
+                <h1 class="welcome-title">Welcome to VEOmenu, {user_name}! 🎉</h1>
+                
+                <p class="welcome-message">
+                    Thank you for joining our community of innovative restaurants and food businesses. 
+                    We're excited to help you create amazing digital menu experiences for your customers.
+                </p>
+                
+                <div class="features">
+                    <h3 style="margin-top: 0; color: #fff;">What you can do with VEOmenu:</h3>
+                    
+                    <div class="feature-item">
+                        <span class="feature-icon">📱</span>
+                        <span>Create stunning digital menus with QR codes</span>
+                    </div>
+                    
+                    <div class="feature-item">
+                        <span class="feature-icon">🎨</span>
+                        <span>Customize designs to match your brand</span>
+                    </div>
+                    
+                    <div class="feature-item">
+                        <span class="feature-icon">📊</span>
+                        <span>Track menu performance and analytics</span>
+                    </div>
+                    
+                    <div class="feature-item">
+                        <span class="feature-icon">🌍</span>
+                        <span>Multi-language support for global reach</span>
+                    </div>
+                    
+                    <div class="feature-item">
+                        <span class="feature-icon">⚡</span>
+                        <span>Real-time menu updates and management</span>
+                    </div>
+                </div>
+                
+                <a href="https://veomenu.com/dashboard" class="cta-button">
+                    Get Started Now →
+                </a>
+                
+                <div class="social-links">
+                    <a href="https://twitter.com/veomenu">🐦 Twitter</a>
+                    <a href="https://facebook.com/veomenu">📘 Facebook</a>
+                    <a href="https://instagram.com/veomenu">📷 Instagram</a>
+                </div>
+                
+                <div class="footer">
+                    <p>Need help? Contact us at <a href="mailto:support@veomenu.com" style="color: #fff;">support@veomenu.com</a></p>
+                    <p>© 2024 VEOmenu. All rights reserved.</p>
+                    <p>You're receiving this email because you signed up for VEOmenu.</p>
+                </div>
+            </div>
+        </body>
+        </html>
+        """
+
+# Split once at import: rendering is then a single three-part concat with no
+# formatting pass over the ~4KB static body
+_WELCOME_PRE, _WELCOME_POST = (
+    _WELCOME_EMAIL_TEMPLATE.replace('{{', '{').replace('}}', '}').split('{user_name}')
+)
+
+_VERIFICATION_EMAIL_PRE, _VERIFICATION_EMAIL_POST = """
+                <h2>Verify Your Email Address</h2>
+                <p>Your verification code is: <strong>{verification_code}</strong></p>
+                <p>This code expires in 10 minutes.</p>
+                <p>If you didn't request this verification, please ignore this email.</p>
+                """.split('{verification_code}')
+
 
 class PhoneService:
     """Service for handling phone number verification via SMS."""
@@ -18,7 +266,7 @@ class PhoneService:
     def __init__(self):
         # Check if Twilio credentials are configured
         if hasattr(settings, 'TWILIO_ACCOUNT_SID') and settings.TWILIO_ACCOUNT_SID and settings.TWILIO_ACCOUNT_SID != 'your_twilio_account_sid_here':
-            self.client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
+            self.client = _get_twilio_client()
             self.phone_number = settings.TWILIO_PHONE_NUMBER
             self.twilio_configured = True
         else:
@@ -26,19 +274,112 @@ class PhoneService:
             self.phone_number = None
             self.twilio_configured = False
     
+    def _get_verification_cached(self, user):
+        """Fetch the user's verification record via cache; None when absent."""
+        verification = cache.get(_verification_cache_key(user.id))
+        if verification is None:
+            verification = PhoneVerification.objects.select_related('user').only(
+                'id', 'phone_number', 'verification_code', 'created_at', 'expires_at',
+                'is_verified', 'attempts', 'max_attempts',
+                'user__id', 'user__phone', 'user__is_phone_verified'
+            ).filter(user=user).first()
+            if verification is not None:
+                cache.set(_verification_cache_key(user.id), verification, timeout=VERIFICATION_CACHE_TTL)
+        return verification
+
+    def _cache_verification(self, verification):
+        """Refresh the cached verification record and phone-owner index."""
+        cache.set(
+            _verification_cache_key(verification.user_id),
+            verification,
+            timeout=VERIFICATION_CACHE_TTL
+        )
+        cache.set(
+            _phone_owner_cache_key(verification.phone_number),
+            verification.user_id,
+            timeout=VERIFICATION_CACHE_TTL
+        )
+
+    def _invalidate_verification_cache(self, verification):
+        cache.delete(_verification_cache_key(verification.user_id))
+        cache.delete(_phone_owner_cache_key(verification.phone_number))
+
     def normalize_phone_number(self, phone_number):
         """Normalize phone number by removing spaces and ensuring proper format."""
+        # Already-normalized input (the stored form) passes through untouched
+        if phone_number and _E164_RE.fullmatch(phone_number):
+            return phone_number
+
         # Remove all non-digit characters except +
-        cleaned = re.sub(r'[^\d+]', '', phone_number)
-        
-        # If it doesn't start with +, add it
-        if not cleaned.startswith('+'):
-            cleaned = '+' + cleaned
-        
-        return cleaned
+        cleaned = phone_number.translate(_PHONE_STRIP_TABLE)
+        if not cleaned.isascii():
+            cleaned = _PHONE_STRIP_RE.sub('', cleaned)
+        return cleaned if cleaned.startswith('+') else '+' + cleaned
     
     def send_verification_sms(self, phone_number, verification_code):
-        """Send SMS with verification code."""
+        """Enqueue the verification SMS so the request doesn't block on Twilio."""
+        from .tasks import send_verification_sms_task
+
+        normalized_phone = self.normalize_phone_number(phone_number)
+        send_verification_sms_task.delay(normalized_phone, verification_code)
+        return {
+            'success': True,
+            'queued': True,
+            'phone_number': normalized_phone
+        }
+
+    def send_verification_sms_bulk(self, items):
+        """
+        Enqueue verification SMS for many recipients in one broker round-trip.
+
+        Args:
+            items: iterable of (phone_number, verification_code) tuples
+        """
+        from celery import group
+        from .tasks import send_verification_sms_task
+
+        signatures = [
+            send_verification_sms_task.s(self.normalize_phone_number(phone), code)
+            for phone, code in items
+        ]
+        if not signatures:
+            return {'success': True, 'queued': 0}
+        group(signatures).apply_async()
+        return {'success': True, 'queued': len(signatures)}
+
+    async def send_verification_sms_async(self, phone_number, verification_code):
+        """Send the verification SMS without blocking the event loop (ASGI)."""
+        if not self.twilio_configured:
+            return {
+                'success': False,
+                'error': 'SMS service not configured. Please contact support.'
+            }
+
+        normalized_phone = self.normalize_phone_number(phone_number)
+        try:
+            response = await _async_http.post(
+                _TWILIO_MESSAGES_URL.format(sid=settings.TWILIO_ACCOUNT_SID),
+                auth=(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN),
+                data={
+                    'Body': _SMS_PRE + str(verification_code) + _SMS_POST,
+                    'From': self.phone_number,
+                    'To': normalized_phone,
+                },
+            )
+            response.raise_for_status()
+            return {
+                'success': True,
+                'message_sid': response.json().get('sid'),
+                'phone_number': normalized_phone
+            }
+        except httpx.HTTPError as e:
+            return {
+                'success': False,
+                'error': str(e)
+            }
+
+    def send_verification_sms_now(self, phone_number, verification_code):
+        """Send SMS with verification code synchronously (runs on a worker)."""
         if not self.twilio_configured:
             return {
                 'success': False,
@@ -49,7 +390,7 @@ class PhoneService:
             normalized_phone = self.normalize_phone_number(phone_number)
             
             message = self.client.messages.create(
-                body=f"Your VEOmenu verification code is: {verification_code}. This code expires in 10 minutes.",
+                body=_SMS_PRE + str(verification_code) + _SMS_POST,
                 from_=self.phone_number,
                 to=normalized_phone
             )
@@ -67,17 +408,19 @@ class PhoneService:
     
     def create_verification(self, user, phone_number):
         """Create a new phone verification record."""
-        # Check if phone number already exists for another user
-        if User.objects.filter(phone=phone_number).exclude(id=user.id).exists():
+        # Cheap cached ownership check; the users_phone_uq constraint is the
+        # real guard and surfaces as IntegrityError at verification time
+        owner_id = cache.get(_phone_owner_cache_key(phone_number))
+        if owner_id is not None and owner_id != user.id:
             return {
                 'success': False,
                 'error': 'Phone number is already registered with another account.'
             }
-        
+
         # Check cooldown period (10 minutes) - single entry per user
         cooldown_minutes = 10
-        try:
-            verification = PhoneVerification.objects.get(user=user)
+        verification = self._get_verification_cached(user)
+        if verification is not None:
             time_remaining = (verification.created_at + timedelta(minutes=cooldown_minutes) - timezone.now()).total_seconds()
             if time_remaining > 0:
                 return {
@@ -85,8 +428,6 @@ class PhoneService:
                     'error': f'Please wait {int(time_remaining / 60)} minutes and {int(time_remaining % 60)} seconds before requesting another code.',
                     'cooldown_remaining': int(time_remaining)
                 }
-        except PhoneVerification.DoesNotExist:
-            pass
         
         # Normalize phone number
         normalized_phone = self.normalize_phone_number(phone_number)
@@ -95,26 +436,22 @@ class PhoneService:
         verification_code = PhoneVerification.generate_verification_code()
         expires_at = timezone.now() + timedelta(minutes=10)
         
-        # Get or create a single verification entry for this user
-        verification, created = PhoneVerification.objects.get_or_create(
-            user=user,
-            defaults={
-                'phone_number': normalized_phone,
-                'verification_code': verification_code,
-                'expires_at': expires_at
-            }
-        )
-        
-        # If entry already exists, update it with new code
-        if not created:
-            verification.phone_number = normalized_phone
-            verification.verification_code = verification_code
-            verification.expires_at = expires_at
-            verification.is_verified = False
-            verification.attempts = 0
-            verification.created_at = timezone.now()  # Update the created_at timestamp
-            verification.save()
-        
+        # Upsert the single verification entry for this user in one statement
+        with transaction.atomic():
+            verification, _ = PhoneVerification.objects.update_or_create(
+                user=user,
+                defaults={
+                    'phone_number': normalized_phone,
+                    'verification_code': verification_code,
+                    'expires_at': expires_at,
+                    'is_verified': False,
+                    'attempts': 0,
+                    'created_at': timezone.now()
+                }
+            )
+
+        self._cache_verification(verification)
+
         # Send SMS
         sms_result = self.send_verification_sms(normalized_phone, verification_code)
         
@@ -128,7 +465,7 @@ class PhoneService:
         else:
             # In development mode, don't delete the verification record
             # Just log the error and return success
-            print(f"SMS failed but continuing in development mode: {sms_result['error']}")
+            logger.warning("SMS failed but continuing in development mode: %s", sms_result['error'])
             return {
                 'success': True,
                 'verification_id': verification.id,
@@ -141,21 +478,33 @@ class PhoneService:
     def verify_code(self, verification_id, code):
         """Verify the provided code."""
         try:
-            verification = PhoneVerification.objects.get(id=verification_id)
+            verification = PhoneVerification.objects.select_related('user').get(id=verification_id)
             
             if verification.verify_code(code):
                 # Update user's phone number and verification status
                 verification.user.phone = verification.phone_number
                 verification.user.is_phone_verified = True
-                verification.user.save()
-                
-                print(f"Phone verification successful for user {verification.user.id}: is_phone_verified = {verification.user.is_phone_verified}")
-                
+                try:
+                    verification.user.save(update_fields=['phone', 'is_phone_verified'])
+                except IntegrityError:
+                    return {
+                        'success': False,
+                        'error': 'Phone number is already registered with another account.'
+                    }
+                self._invalidate_verification_cache(verification)
+
+                logger.debug("Phone verification successful for user %s", verification.user.id)
+
                 return {
                     'success': True,
                     'message': 'Phone number verified successfully.'
                 }
             else:
+                cache.set(
+                    _verification_cache_key(verification.user_id),
+                    verification,
+                    timeout=VERIFICATION_CACHE_TTL
+                )
                 return {
                     'success': False,
                     'error': 'Invalid verification code or code has expired.'
@@ -166,44 +515,72 @@ class PhoneService:
                 'error': 'Verification record not found.'
             }
     
+    def _verify_rate_limited(self, user):
+        """Return True once a user exceeds the per-minute verification budget."""
+        key = f'verify_rate:{user.id}'
+        try:
+            attempts = cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=60)
+            attempts = 1
+        return attempts > VERIFY_RATE_LIMIT_PER_MINUTE
+
     def verify_code_for_user(self, user, code):
         """Verify the provided code for a specific user (single entry per user)."""
-        try:
-            verification = PhoneVerification.objects.get(user=user)
+        if self._verify_rate_limited(user):
+            return {
+                'success': False,
+                'error': 'Too many verification attempts. Please try again in a minute.'
+            }
+
+        verification = self._get_verification_cached(user)
+        if verification is None:
+            return {
+                'success': False,
+                'error': 'No verification code found for this user.'
+            }
+
+        if verification.is_verified:
+            return {
+                'success': False,
+                'error': 'This verification code has already been used.'
+            }
             
-            if verification.is_verified:
-                return {
-                    'success': False,
-                    'error': 'This verification code has already been used.'
-                }
+        if verification.expires_at < timezone.now():
+            return {
+                'success': False,
+                'error': 'Verification code has expired.'
+            }
             
-            if verification.expires_at < timezone.now():
+        if verification.verify_code(code):
+            # Update user's phone number and verification status
+            verification.user.phone = verification.phone_number
+            verification.user.is_phone_verified = True
+            try:
+                verification.user.save(update_fields=['phone', 'is_phone_verified'])
+            except IntegrityError:
                 return {
                     'success': False,
-                    'error': 'Verification code has expired.'
+                    'error': 'Phone number is already registered with another account.'
                 }
-            
-            if verification.verify_code(code):
-                # Update user's phone number and verification status
-                verification.user.phone = verification.phone_number
-                verification.user.is_phone_verified = True
-                verification.user.save()
-                
-                print(f"Phone verification successful for user {verification.user.id}: is_phone_verified = {verification.user.is_phone_verified}")
-                
-                return {
-                    'success': True,
-                    'message': 'Phone number verified successfully.'
-                }
-            else:
-                return {
-                    'success': False,
-                    'error': 'Invalid verification code.'
-                }
-        except PhoneVerification.DoesNotExist:
+            self._invalidate_verification_cache(verification)
+
+            logger.debug("Phone verification successful for user %s", verification.user.id)
+
+            return {
+                'success': True,
+                'message': 'Phone number verified successfully.'
+            }
+        else:
+            # Keep the cached copy's attempts counter in sync
+            cache.set(
+                _verification_cache_key(verification.user_id),
+                verification,
+                timeout=VERIFICATION_CACHE_TTL
+            )
             return {
                 'success': False,
-                'error': 'No verification code found for this user.'
+                'error': 'Invalid verification code.'
             }
 
 
@@ -212,35 +589,79 @@ class EmailService:
     
     def __init__(self):
         # Check if SendGrid is configured
-        print(f"EmailService: Checking SendGrid configuration...")
-        print(f"EmailService: SENDGRID_API_KEY exists: {hasattr(settings, 'SENDGRID_API_KEY')}")
-        if hasattr(settings, 'SENDGRID_API_KEY'):
-            print(f"EmailService: SENDGRID_API_KEY value: {settings.SENDGRID_API_KEY}")
-            print(f"EmailService: SENDGRID_API_KEY length: {len(settings.SENDGRID_API_KEY) if settings.SENDGRID_API_KEY else 0}")
-        
         if hasattr(settings, 'SENDGRID_API_KEY') and settings.SENDGRID_API_KEY:
-            print(f"EmailService: SendGrid configured, creating client...")
-            self.sg = SendGridAPIClient(api_key=settings.SENDGRID_API_KEY)
+            self.sg = _get_sendgrid_client()
             self.sendgrid_configured = True
-            print(f"EmailService: SendGrid client created successfully")
         else:
-            print(f"EmailService: SendGrid not configured, using development mode")
+            logger.debug("SendGrid not configured, using development mode")
             self.sg = None
             self.sendgrid_configured = False
     
     def send_verification_email(self, to_email, verification_code):
-        """Send email with verification code."""
+        """Enqueue the verification email so the request doesn't block on SendGrid."""
+        from .tasks import send_verification_email_task
+
+        send_verification_email_task.delay(to_email, verification_code)
+        return {'success': True, 'queued': True}
+
+    def send_verification_email_bulk(self, items):
+        """
+        Enqueue verification emails for many recipients in one broker round-trip.
+
+        Args:
+            items: iterable of (to_email, verification_code) tuples
+        """
+        from celery import group
+        from .tasks import send_verification_email_task
+
+        signatures = [send_verification_email_task.s(email, code) for email, code in items]
+        if not signatures:
+            return {'success': True, 'queued': 0}
+        group(signatures).apply_async()
+        return {'success': True, 'queued': len(signatures)}
+
+    async def send_verification_email_async(self, to_email, verification_code):
+        """Send the verification email without blocking the event loop (ASGI)."""
+        if not self.sendgrid_configured:
+            return {
+                'success': False,
+                'error': 'Email service not configured.'
+            }
+
+        payload = {
+            'personalizations': [{'to': [{'email': to_email}]}],
+            'from': {'email': 'ricardomiguelrosaclemente@gmail.com'},
+            'subject': 'VEOmenu - Email Verification',
+            'content': [{
+                'type': 'text/html',
+                'value': _VERIFICATION_EMAIL_PRE + str(verification_code) + _VERIFICATION_EMAIL_POST,
+            }],
+        }
+        try:
+            response = await _async_http.post(
+                _SENDGRID_SEND_URL,
+                json=payload,
+                headers={'Authorization': f'Bearer {settings.SENDGRID_API_KEY}'},
+            )
+            response.raise_for_status()
+            return {
+                'success': True,
+                'status_code': response.status_code
+            }
+        except httpx.HTTPError as e:
+            return {
+                'success': False,
+                'error': str(e)
+            }
+
+    def send_verification_email_now(self, to_email, verification_code):
+        """Send email with verification code synchronously (runs on a worker)."""
         try:
             message = Mail(
                 from_email='ricardomiguelrosaclemente@gmail.com',
                 to_emails=to_email,
                 subject='VEOmenu - Email Verification',
-                html_content=f"""
-                <h2>Verify Your Email Address</h2>
-                <p>Your verification code is: <strong>{verification_code}</strong></p>
-                <p>This code expires in 10 minutes.</p>
-                <p>If you didn't request this verification, please ignore this email.</p>
-                """
+                html_content=_VERIFICATION_EMAIL_PRE + str(verification_code) + _VERIFICATION_EMAIL_POST
             )
             
             response = self.sg.send(message)
@@ -256,7 +677,14 @@ class EmailService:
             }
     
     def send_welcome_email(self, to_email, user_name):
-        """Send welcome email to new user."""
+        """Enqueue the welcome email so registration doesn't block on SendGrid."""
+        from .tasks import send_welcome_email_task
+
+        send_welcome_email_task.delay(to_email, user_name)
+        return {'success': True, 'queued': True}
+
+    def send_welcome_email_now(self, to_email, user_name):
+        """Send welcome email to new user synchronously (runs on a worker)."""
         # if not self.sendgrid_configured:
         #     print(f"SendGrid not configured. Welcome email for {to_email} would be sent here.")
         #     # Development mode fallback
@@ -278,10 +706,8 @@ class EmailService:
                 html_content=self._get_welcome_email_template(user_name)
             )
             
-            print(f"Attempting to send welcome email to {to_email}")
             response = self.sg.send(message)
-            print(f"SendGrid response: {response.status_code}")
-            print(f"SendGrid headers: {response.headers}")
+            logger.debug("SendGrid welcome email to %s: status %s", to_email, response.status_code)
             
             return {
                 'success': True,
@@ -289,162 +715,25 @@ class EmailService:
                 'headers': dict(response.headers)
             }
         except Exception as e:
-            print(f"SendGrid error: {str(e)}")
+            logger.error("SendGrid error sending welcome email to %s: %s", to_email, e)
             return {
                 'success': False,
                 'error': str(e)
             }
     
     def _get_welcome_email_template(self, user_name):
-        """Generate welcome email HTML template."""
-        return f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Welcome to VEOmenu</title>
-            <style>
-                body {{
-                    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    max-width: 600px;
-                    margin: 0 auto;
-                    padding: 20px;
-                    background-color: #f8f9fa;
-                }}
-                .container {{
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    border-radius: 12px;
-                    padding: 40px;
-                    color: white;
-                    text-align: center;
-                }}
-                .logo {{
-                    font-size: 32px;
-                    font-weight: bold;
-                    margin-bottom: 20px;
-                    text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-                }}
-                .welcome-title {{
-                    font-size: 28px;
-                    margin-bottom: 20px;
-                    color: #fff;
-                }}
-                .welcome-message {{
-                    font-size: 18px;
-                    margin-bottom: 30px;
-                    opacity: 0.9;
-                }}
-                .features {{
-                    background: rgba(255,255,255,0.1);
-                    border-radius: 8px;
-                    padding: 30px;
-                    margin: 30px 0;
-                    backdrop-filter: blur(10px);
-                }}
-                .feature-item {{
-                    display: flex;
-                    align-items: center;
-                    margin: 15px 0;
-                    font-size: 16px;
-                }}
-                .feature-icon {{
-                    font-size: 24px;
-                    margin-right: 15px;
-                    width: 30px;
-                }}
-                .cta-button {{
-                    display: inline-block;
-                    background: linear-gradient(45deg, #ff6b6b, #ee5a24);
-                    color: white;
-                    padding: 15px 30px;
-                    text-decoration: none;
-                    border-radius: 25px;
-                    font-weight: bold;
-                    font-size: 18px;
-                    margin: 20px 0;
-                    box-shadow: 0 4px 15px rgba(255, 107, 107, 0.3);
-                    transition: transform 0.3s ease;
-                }}
-                .cta-button:hover {{
-                    transform: translateY(-2px);
-                }}
-                .footer {{
-                    margin-top: 40px;
-                    padding-top: 20px;
-                    border-top: 1px solid rgba(255,255,255,0.2);
-                    font-size: 14px;
-                    opacity: 0.8;
-                }}
-                .social-links {{
-                    margin: 20px 0;
-                }}
-                .social-links a {{
-                    color: white;
-                    text-decoration: none;
-                    margin: 0 10px;
-                    font-size: 18px;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="logo">🍽️ VEOmenu</div>
-                
-                <h1 class="welcome-title">Welcome to VEOmenu, {user_name}! 🎉</h1>
-                
-                <p class="welcome-message">
-                    Thank you for joining our community of innovative restaurants and food businesses. 
-                    We're excited to help you create amazing digital menu experiences for your customers.
-                </p>
-                
-                <div class="features">
-                    <h3 style="margin-top: 0; color: #fff;">What you can do with VEOmenu:</h3>
-                    
-                    <div class="feature-item">
-                        <span class="feature-icon">📱</span>
-                        <span>Create stunning digital menus with QR codes</span>
-                    </div>
-                    
-                    <div class="feature-item">
-                        <span class="feature-icon">🎨</span>
-                        <span>Customize designs to match your brand</span>
-                    </div>
-                    
-                    <div class="feature-item">
-                        <span class="feature-icon">📊</span>
-                        <span>Track menu performance and analytics</span>
-                    </div>
-                    
-                    <div class="feature-item">
-                        <span class="feature-icon">🌍</span>
-                        <span>Multi-language support for global reach</span>
-                    </div>
-                    
-                    <div class="feature-item">
-                        <span class="feature-icon">⚡</span>
-                        <span>Real-time menu updates and management</span>
-                    </div>
-                </div>
-                
-                <a href="https://veomenu.com/dashboard" class="cta-button">
-                    Get Started Now →
-                </a>
-                
-                <div class="social-links">
-                    <a href="https://twitter.com/veomenu">🐦 Twitter</a>
-                    <a href="https://facebook.com/veomenu">📘 Facebook</a>
-                    <a href="https://instagram.com/veomenu">📷 Instagram</a>
-                </div>
-                
-                <div class="footer">
-                    <p>Need help? Contact us at <a href="mailto:support@veomenu.com" style="color: #fff;">support@veomenu.com</a></p>
-                    <p>© 2024 VEOmenu. All rights reserved.</p>
-                    <p>You're receiving this email because you signed up for VEOmenu.</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+        """Render the welcome email by splicing user_name into the static body."""
+        return _WELCOME_PRE + user_name + _WELCOME_POST
+
+
+@lru_cache(maxsize=1)
+def get_phone_service():
+    """Process-wide PhoneService; construction re-reads settings and grabs the
+    shared Twilio client, so one instance serves all requests."""
+    return PhoneService()
+
+
+@lru_cache(maxsize=1)
+def get_email_service():
+    """Process-wide EmailService, for the same reason as get_phone_service."""
+    return EmailService()
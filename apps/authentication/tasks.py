@@ -0,0 +1,132 @@
+"""
+Celery tasks for outbound email and SMS.
+
+Keeps SendGrid/Twilio round-trips off the request thread; user-facing
+endpoints enqueue and return immediately while workers retry transient
+provider failures with exponential backoff.
+"""
+from smtplib import SMTPException
+
+from celery import shared_task
+from twilio.base.exceptions import TwilioRestException
+
+
+@shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=True, max_retries=5)
+def send_welcome_email_task(self, to_email, user_name):
+    """Send the welcome email via SendGrid on a worker."""
+    from .services import get_email_service
+    return get_email_service().send_welcome_email_now(to_email, user_name)
+
+
+@shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=True, max_retries=5)
+def send_verification_email_task(self, to_email, verification_code):
+    """Send the email verification code via SendGrid on a worker."""
+    from .services import get_email_service
+    return get_email_service().send_verification_email_now(to_email, verification_code)
+
+
+@shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=True, max_retries=5)
+def send_verification_sms_task(self, phone_number, verification_code):
+    """Send the SMS verification code via Twilio on a worker."""
+    from .services import get_phone_service
+    return get_phone_service().send_verification_sms_now(phone_number, verification_code)
+
+
+def _magic_link_message(email, magic_url):
+    from django.conf import settings
+    from django.core.mail import EmailMessage
+
+    return EmailMessage(
+        subject='Your VEOmenu Login Link',
+        body=f'Click here to log in: {magic_url}\n\nThis link expires in 15 minutes.',
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[email],
+    )
+
+
+@shared_task(bind=True, autoretry_for=(SMTPException,), retry_backoff=True, max_retries=5)
+def send_magic_link_email_task(self, email, magic_url):
+    """Send the magic-link login email on a worker."""
+    _magic_link_message(email, magic_url).send(fail_silently=False)
+
+
+@shared_task(bind=True, autoretry_for=(SMTPException,), retry_backoff=True, max_retries=5)
+def send_magic_link_emails_batch_task(self, items):
+    """
+    Send many magic-link emails over one SMTP session.
+
+    Args:
+        items: iterable of (email, magic_url) pairs
+
+    send_messages reuses a single connection for the whole batch, paying
+    the SMTP handshake once instead of per recipient.
+    """
+    from django.core.mail import get_connection
+
+    messages = [_magic_link_message(email, magic_url) for email, magic_url in items]
+    with get_connection() as connection:
+        return connection.send_messages(messages)
+
+
+@shared_task(bind=True, autoretry_for=(TwilioRestException,), retry_backoff=True,
+             retry_backoff_max=60, max_retries=3)
+def twilio_send_otp_task(self, phone_number, otp_code):
+    """Send an OTP SMS through TwilioService on a worker."""
+    from .utils import TwilioService
+    return TwilioService.send_otp(phone_number, otp_code)
+
+
+@shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=True,
+             retry_backoff_max=60, max_retries=3)
+def sendgrid_send_otp_email_task(self, user_email, user_name, otp_code):
+    """Send an OTP email through SendGridService on a worker."""
+    from .utils import SendGridService
+    return SendGridService.send_otp_email(user_email, user_name, otp_code)
+
+
+@shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=True,
+             retry_backoff_max=60, max_retries=3)
+def sendgrid_send_welcome_email_task(self, user_email, user_name):
+    """Send the branded welcome email through SendGridService on a worker."""
+    from .utils import SendGridService
+    return SendGridService.send_welcome_email(user_email, user_name)
+
+
+@shared_task
+def expire_phone_verifications():
+    """Flip expired, unverified codes in one UPDATE so reads stay read-only."""
+    from django.utils import timezone
+    from .models import PhoneVerification
+
+    return PhoneVerification.objects.filter(
+        expires_at__lt=timezone.now(), is_verified=False
+    ).update(is_verified=True)
+
+
+@shared_task
+def expire_magic_links():
+    """Mark expired, unused magic links as used in one UPDATE."""
+    from django.utils import timezone
+    from .models import MagicLink
+
+    return MagicLink.objects.filter(
+        expires_at__lt=timezone.now(), is_used=False
+    ).update(is_used=True)
+
+
+@shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=True, max_retries=3)
+def record_user_session_task(self, user_id, token, refresh_token, user_agent,
+                             device_type, ip_address, expires_at):
+    """Insert the UserSession audit row off the login hot path."""
+    from django.utils.dateparse import parse_datetime
+    from .models import UserSession
+
+    UserSession.objects.bulk_create([UserSession(
+        user_id=user_id,
+        token=token,
+        refresh_token=refresh_token,
+        user_agent=user_agent,
+        device_type=device_type,
+        ip_address=ip_address,
+        expires_at=parse_datetime(expires_at),
+    )], ignore_conflicts=True)
@@ -3,13 +3,245 @@ Utility functions for authentication
 Handles OTP sending via SMS (Twilio) and Email (SendGrid)
 """
 from django.conf import settings
-from twilio.rest import Client
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail, Email, To, Content
+from django.db import transaction
+from django.template import loader
+from requests.adapters import HTTPAdapter
+from requests.exceptions import HTTPError, RequestException
+import asyncio
+import re
+from functools import lru_cache
+from collections import OrderedDict
+import requests
+import httpx
 import logging
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+# Shared pooled client for async sends; ASGI handlers await provider calls
+# without blocking the event loop, and concurrent sends multiplex over warm
+# keep-alive connections.
+# Every outbound call pins explicit (connect, read) timeouts so a hung
+# provider connection can cost at most ~13s, not a worker held for minutes.
+_HTTP_TIMEOUT = (3.0, 10.0)
+
+_SENDGRID_SEND_URL = "https://api.sendgrid.com/v3/mail/send"
+_async_http = httpx.AsyncClient(
+    timeout=httpx.Timeout(10.0, connect=5.0),
+    limits=httpx.Limits(max_keepalive_connections=100, keepalive_expiry=75.0),
+)
+# Cap in-flight async sends to stay under SendGrid's request rate
+_ASYNC_SEND_LIMIT = asyncio.Semaphore(14)
+
+
+class _RateLimiter:
+    """
+    Token bucket limiting outbound provider calls per second.
+
+    acquire() blocks the caller just long enough for a send credit to
+    accrue, so bursts queue briefly instead of surfacing provider 429s.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self.tokens = self.capacity
+        self.last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+                self.last = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class _RecentSends:
+    """
+    Process-local TTL record of recently sent messages.
+
+    Retries and double-submits for the same recipient/code within the
+    window are suppressed instead of paying a second provider round-trip.
+    """
+
+    def __init__(self, maxsize=10000, ttl=30):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def seen(self, key):
+        """Return True if key was recorded within the last ttl seconds."""
+        with self._lock:
+            expiry = self._entries.get(key)
+            return expiry is not None and expiry > time.monotonic()
+
+    def add(self, key):
+        """Record key, pruning expired and overflow entries from the front."""
+        now = time.monotonic()
+        with self._lock:
+            self._entries.pop(key, None)
+            while self._entries:
+                oldest = next(iter(self._entries))
+                if self._entries[oldest] > now and len(self._entries) < self.maxsize:
+                    break
+                del self._entries[oldest]
+            self._entries[key] = now + self.ttl
+
+
+class _CircuitBreaker:
+    """
+    Closed/open/half-open breaker around one provider.
+
+    After fail_max consecutive failures the circuit opens and sends fail
+    fast for reset_timeout seconds instead of each waiting out the full
+    connect/read timeout; once the cooldown elapses, probe calls are let
+    through and a success closes the circuit again.
+    """
+
+    def __init__(self, fail_max=5, reset_timeout=30):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self.opened_at is None:
+                return 'closed'
+            if time.monotonic() - self.opened_at >= self.reset_timeout:
+                return 'half-open'
+            return 'open'
+
+    def allow(self):
+        """Whether a send may proceed right now."""
+        with self._lock:
+            return (self.opened_at is None
+                    or time.monotonic() - self.opened_at >= self.reset_timeout)
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.fail_max:
+                self.opened_at = time.monotonic()
+
+
+_RECENT_SENDS = _RecentSends()
+_TWILIO_CB = _CircuitBreaker()
+_SENDGRID_CB = _CircuitBreaker()
+
+# SendGrid free/essentials tiers throttle around 14 req/s; Twilio tolerates
+# far more but still benefits from a cap under burst load.
+_SENDGRID_RL = _RateLimiter(rate=14)
+_TWILIO_RL = _RateLimiter(rate=100)
+
+# SendGrid caps /mail/send at 1000 personalizations per request
+_SENDGRID_BATCH_LIMIT = 1000
+
+# Template indentation is ~500 bytes of inter-tag whitespace per email that
+# only inflates the bytes encrypted and sent per POST; collapse it before
+# handing the body to SendGrid. (requests already advertises gzip/deflate
+# for response bodies by default.)
+_INTER_TAG_WS_RE = re.compile(r'>\s+<')
+
+
+@lru_cache(maxsize=None)
+def _get_template(name):
+    """
+    Process-wide compiled template handle.
+
+    The cached loader already parses each template once, but rendering via
+    the loader helpers still pays an engine lookup and the loader's locked
+    cache probe per send; holding the compiled Template here reduces a
+    render to a plain node-tree walk. Django's default autoescaping applies,
+    so user-supplied names are HTML-escaped in the rendered bodies.
+    """
+    return loader.get_template(name)
+
+
+def _minify_html(html):
+    """Collapse whitespace between tags; roughly halves the body size."""
+    return _INTER_TAG_WS_RE.sub('><', html).strip()
+
+
+def _fmt_otp(code):
+    """
+    Render an OTP as exactly six ASCII digits.
+
+    Integer codes are written digit-by-digit into a bytearray, skipping
+    CPython's generic int-to-str machinery and guaranteeing the leading
+    zeros a %06d code needs; strings pass through untouched.
+    """
+    if not isinstance(code, int):
+        return code
+    buf = bytearray(6)
+    for i in range(5, -1, -1):
+        code, digit = divmod(code, 10)
+        buf[i] = 48 + digit
+    return buf.decode('ascii')
+
+# Both providers are used for exactly one endpoint each, so skip the SDKs
+# and POST straight to their REST APIs over warm, pooled sessions that keep
+# TLS connections alive across sends. Hand-built dict payloads also avoid
+# the SDKs' helper-object trees and per-field validation.
+_TWILIO_MESSAGES_URL = (
+    f"https://api.twilio.com/2010-04-01/Accounts/{settings.TWILIO_ACCOUNT_SID}/Messages.json"
+)
+_twilio_session = requests.Session()
+_twilio_session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=50))
+_twilio_session.auth = (settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
+
+_sendgrid_session = requests.Session()
+_sendgrid_session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=50))
+_sendgrid_session.headers["Authorization"] = f"Bearer {settings.SENDGRID_API_KEY}"
+
+
+# Email bodies live in templates/emails/ and are parsed once process-wide by
+# the cached template loader; only a handful of placeholders vary per send.
+# settings.FRONTEND_URL never changes at runtime, so the dashboard link is
+# baked in up front.
+_DASHBOARD_URL = f"{settings.FRONTEND_URL}/dashboard"
+
+# The sender identity and subjects never vary either; binding them once
+# avoids a LazySettings lookup and a dict construction per send.
+_SENDGRID_FROM = {"email": settings.DEFAULT_FROM_EMAIL, "name": "VEOmenu Team"}
+_WELCOME_SUBJECT = "Welcome to VEOmenu!"
+_OTP_SUBJECT = "Your VEOmenu Verification Code"
+
+
+def _mail_payload(user_email, subject, plain, html):
+    """
+    Assemble a single-recipient /mail/send payload.
+
+    The payload shape is fixed, so every send shares the one constant
+    sender dict and only the recipient, subject and two content leaves are
+    fresh allocations.
+    """
+    return {
+        "personalizations": [{"to": [{"email": user_email}]}],
+        "from": _SENDGRID_FROM,
+        "subject": subject,
+        "content": [
+            {"type": "text/plain", "value": plain},
+            {"type": "text/html", "value": html},
+        ],
+    }
+_SENDGRID_AUTH_HEADERS = {"Authorization": f"Bearer {settings.SENDGRID_API_KEY}"}
+
 
 class TwilioService:
     """Service for sending SMS via Twilio"""
@@ -27,28 +259,74 @@ class TwilioService:
             tuple: (success: bool, message: str)
         """
         try:
-            # Initialize Twilio client
-            client = Client(
-                settings.TWILIO_ACCOUNT_SID,
-                settings.TWILIO_AUTH_TOKEN
-            )
+            otp_code = _fmt_otp(otp_code)
+
+            dedupe_key = ('sms', phone_number, otp_code)
+            if _RECENT_SENDS.seen(dedupe_key):
+                return True, "OTP already sent"
+
+            if not _TWILIO_CB.allow():
+                return False, "SMS provider unavailable"
 
             # Compose message
             message_body = f"Your VEOmenu verification code is: {otp_code}\n\nThis code expires in 10 minutes."
 
             # Send SMS
-            message = client.messages.create(
-                body=message_body,
-                from_=settings.TWILIO_PHONE_NUMBER,
-                to=phone_number
+            _TWILIO_RL.acquire()
+            response = _twilio_session.post(
+                _TWILIO_MESSAGES_URL,
+                data={
+                    "From": settings.TWILIO_PHONE_NUMBER,
+                    "To": phone_number,
+                    "Body": message_body,
+                },
+                timeout=_HTTP_TIMEOUT,
             )
+            response.raise_for_status()
+            _TWILIO_CB.record_success()
+            _RECENT_SENDS.add(dedupe_key)
 
-            logger.info(f"OTP sent successfully to {phone_number}. SID: {message.sid}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("OTP sent successfully to %s. SID: %s",
+                            phone_number, response.json().get("sid"))
             return True, "OTP sent successfully"
 
-        except Exception as e:
-            logger.error(f"Failed to send OTP to {phone_number}: {str(e)}")
-            return False, f"Failed to send OTP: {str(e)}"
+        except HTTPError as e:
+            # Log status fields only; provider error bodies can be kilobytes
+            # of JSON and stringifying them amplifies load during 429 storms
+            _TWILIO_CB.record_failure()
+            logger.error("Failed to send OTP to %s: HTTP %s %s", phone_number,
+                         e.response.status_code, e.response.reason)
+            return False, "Failed to send OTP"
+        except RequestException:
+            _TWILIO_CB.record_failure()
+            logger.error("Failed to send OTP to %s: network error", phone_number)
+            return False, "Failed to send OTP"
+
+    @classmethod
+    def send_otp_async(cls, phone_number, otp_code):
+        """
+        Queue the OTP SMS on a Celery worker and return immediately.
+
+        Keeps the Twilio round-trip off the request thread; the worker
+        retries transient provider failures with exponential backoff.
+        """
+        from .tasks import twilio_send_otp_task
+        twilio_send_otp_task.delay(phone_number, otp_code)
+        return True, "OTP queued"
+
+    @classmethod
+    def enqueue_otp(cls, phone_number, otp_code):
+        """
+        Queue the OTP SMS once the current transaction commits.
+
+        Sending from inside the transaction would hold the DB connection
+        across the provider round-trip and could SMS a code whose row is
+        later rolled back; on_commit avoids both.
+        """
+        from .tasks import twilio_send_otp_task
+        transaction.on_commit(lambda: twilio_send_otp_task.delay(phone_number, otp_code))
+        return True, "OTP queued"
 
 
 class SendGridService:
@@ -67,135 +345,54 @@ class SendGridService:
             tuple: (success: bool, message: str)
         """
         try:
-            # Initialize SendGrid client
-            sg = SendGridAPIClient(settings.SENDGRID_API_KEY)
-
-            # Create email content
-            from_email = Email(settings.DEFAULT_FROM_EMAIL, "VEOmenu Team")
-            to_email = To(user_email)
-            subject = "Welcome to VEOmenu!"
-
-            # HTML content with VEOmenu branding
-            html_content = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <meta charset="UTF-8">
-                <meta name="viewport" content="width=device-width, initial-scale=1.0">
-                <title>Welcome to VEOmenu</title>
-            </head>
-            <body style="margin: 0; padding: 0; font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; background-color: #f4f4f4;">
-                <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #f4f4f4; padding: 40px 0;">
-                    <tr>
-                        <td align="center">
-                            <table width="600" cellpadding="0" cellspacing="0" style="background-color: #ffffff; border-radius: 10px; overflow: hidden; box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);">
-                                <!-- Header -->
-                                <tr>
-                                    <td style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 40px 30px; text-align: center;">
-                                        <h1 style="margin: 0; color: #ffffff; font-size: 32px; font-weight: 700;">VEOmenu</h1>
-                                        <p style="margin: 10px 0 0 0; color: #ffffff; font-size: 16px; opacity: 0.9;">Digital Menu Platform</p>
-                                    </td>
-                                </tr>
-
-                                <!-- Content -->
-                                <tr>
-                                    <td style="padding: 40px 30px;">
-                                        <h2 style="margin: 0 0 20px 0; color: #333333; font-size: 24px;">Welcome, {user_name}!</h2>
-                                        <p style="margin: 0 0 15px 0; color: #666666; font-size: 16px; line-height: 1.6;">
-                                            Thank you for joining VEOmenu, the modern digital menu platform for restaurants and businesses.
-                                        </p>
-                                        <p style="margin: 0 0 15px 0; color: #666666; font-size: 16px; line-height: 1.6;">
-                                            Your account has been successfully created and verified. You can now start creating beautiful, interactive menus for your customers.
-                                        </p>
-
-                                        <!-- CTA Button -->
-                                        <table width="100%" cellpadding="0" cellspacing="0" style="margin: 30px 0;">
-                                            <tr>
-                                                <td align="center">
-                                                    <a href="{settings.FRONTEND_URL}/dashboard"
-                                                       style="display: inline-block; padding: 15px 40px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                                                              color: #ffffff; text-decoration: none; border-radius: 5px; font-size: 16px; font-weight: 600;">
-                                                        Get Started
-                                                    </a>
-                                                </td>
-                                            </tr>
-                                        </table>
-
-                                        <!-- Features -->
-                                        <div style="margin: 30px 0; padding: 20px; background-color: #f8f9fa; border-radius: 5px;">
-                                            <h3 style="margin: 0 0 15px 0; color: #333333; font-size: 18px;">What's next?</h3>
-                                            <ul style="margin: 0; padding-left: 20px; color: #666666; font-size: 14px; line-height: 1.8;">
-                                                <li>Create your first digital menu</li>
-                                                <li>Customize your menu design</li>
-                                                <li>Add items with images and descriptions</li>
-                                                <li>Share your menu with QR codes</li>
-                                                <li>Track analytics and insights</li>
-                                            </ul>
-                                        </div>
-
-                                        <p style="margin: 20px 0 0 0; color: #666666; font-size: 14px; line-height: 1.6;">
-                                            If you have any questions or need assistance, feel free to reach out to our support team.
-                                        </p>
-                                    </td>
-                                </tr>
-
-                                <!-- Footer -->
-                                <tr>
-                                    <td style="background-color: #f8f9fa; padding: 30px; text-align: center; border-top: 1px solid #e0e0e0;">
-                                        <p style="margin: 0 0 10px 0; color: #999999; font-size: 12px;">
-                                            © 2025 VEOmenu. All rights reserved.
-                                        </p>
-                                        <p style="margin: 0; color: #999999; font-size: 12px;">
-                                            This email was sent to {user_email}
-                                        </p>
-                                    </td>
-                                </tr>
-                            </table>
-                        </td>
-                    </tr>
-                </table>
-            </body>
-            </html>
-            """
-
-            # Plain text fallback
-            plain_content = f"""
-            Welcome to VEOmenu, {user_name}!
-
-            Thank you for joining VEOmenu, the modern digital menu platform for restaurants and businesses.
-
-            Your account has been successfully created and verified. You can now start creating beautiful, interactive menus for your customers.
-
-            Get started: {settings.FRONTEND_URL}/dashboard
-
-            What's next?
-            - Create your first digital menu
-            - Customize your menu design
-            - Add items with images and descriptions
-            - Share your menu with QR codes
-            - Track analytics and insights
-
-            If you have any questions or need assistance, feel free to reach out to our support team.
-
-            © 2025 VEOmenu. All rights reserved.
-            """
-
-            # Create and send email
-            mail = Mail(
-                from_email=from_email,
-                to_emails=to_email,
-                subject=subject,
-                plain_text_content=plain_content,
-                html_content=html_content
+            dedupe_key = ('welcome', user_email)
+            if _RECENT_SENDS.seen(dedupe_key):
+                return True, "Welcome email already sent"
+
+            if not _SENDGRID_CB.allow():
+                return False, "Email provider unavailable"
+
+            # Render via the cached template loader
+            context = {
+                'user_name': user_name,
+                'user_email': user_email,
+                'dashboard_url': _DASHBOARD_URL,
+            }
+            payload = _mail_payload(
+                user_email,
+                _WELCOME_SUBJECT,
+                _get_template('emails/welcome.txt').render(context),
+                _minify_html(_get_template('emails/welcome.html').render(context)),
             )
 
-            response = sg.send(mail)
-            logger.info(f"Welcome email sent successfully to {user_email}. Status: {response.status_code}")
+            _SENDGRID_RL.acquire()
+            response = _sendgrid_session.post(
+                _SENDGRID_SEND_URL, json=payload, timeout=_HTTP_TIMEOUT
+            )
+            response.raise_for_status()
+            _SENDGRID_CB.record_success()
+            _RECENT_SENDS.add(dedupe_key)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Welcome email sent successfully to %s. Status: %s",
+                            user_email, response.status_code)
             return True, "Welcome email sent successfully"
 
-        except Exception as e:
-            logger.error(f"Failed to send welcome email to {user_email}: {str(e)}")
-            return False, f"Failed to send email: {str(e)}"
+        except HTTPError as e:
+            _SENDGRID_CB.record_failure()
+            logger.error("Failed to send welcome email to %s: HTTP %s %s", user_email,
+                         e.response.status_code, e.response.reason)
+            return False, "Failed to send email"
+        except RequestException:
+            _SENDGRID_CB.record_failure()
+            logger.error("Failed to send welcome email to %s: network error", user_email)
+            return False, "Failed to send email"
+
+    @classmethod
+    def send_welcome_email_async(cls, user_email, user_name):
+        """Queue the welcome email on a Celery worker and return immediately."""
+        from .tasks import sendgrid_send_welcome_email_task
+        sendgrid_send_welcome_email_task.delay(user_email, user_name)
+        return True, "Welcome email queued"
 
     @staticmethod
     def send_otp_email(user_email, user_name, otp_code):
@@ -211,106 +408,184 @@ class SendGridService:
             tuple: (success: bool, message: str)
         """
         try:
-            # Initialize SendGrid client
-            sg = SendGridAPIClient(settings.SENDGRID_API_KEY)
-
-            # Create email content
-            from_email = Email(settings.DEFAULT_FROM_EMAIL, "VEOmenu Team")
-            to_email = To(user_email)
-            subject = "Your VEOmenu Verification Code"
-
-            # HTML content
-            html_content = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <meta charset="UTF-8">
-                <meta name="viewport" content="width=device-width, initial-scale=1.0">
-                <title>VEOmenu Verification Code</title>
-            </head>
-            <body style="margin: 0; padding: 0; font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; background-color: #f4f4f4;">
-                <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #f4f4f4; padding: 40px 0;">
-                    <tr>
-                        <td align="center">
-                            <table width="600" cellpadding="0" cellspacing="0" style="background-color: #ffffff; border-radius: 10px; overflow: hidden; box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);">
-                                <!-- Header -->
-                                <tr>
-                                    <td style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 40px 30px; text-align: center;">
-                                        <h1 style="margin: 0; color: #ffffff; font-size: 32px; font-weight: 700;">VEOmenu</h1>
-                                        <p style="margin: 10px 0 0 0; color: #ffffff; font-size: 16px; opacity: 0.9;">Verification Code</p>
-                                    </td>
-                                </tr>
-
-                                <!-- Content -->
-                                <tr>
-                                    <td style="padding: 40px 30px; text-align: center;">
-                                        <h2 style="margin: 0 0 20px 0; color: #333333; font-size: 24px;">Hello, {user_name}!</h2>
-                                        <p style="margin: 0 0 30px 0; color: #666666; font-size: 16px; line-height: 1.6;">
-                                            Your verification code is:
-                                        </p>
-
-                                        <!-- OTP Code -->
-                                        <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                                                    padding: 20px; border-radius: 10px; margin: 0 0 30px 0;">
-                                            <p style="margin: 0; color: #ffffff; font-size: 48px; font-weight: 700; letter-spacing: 8px;">
-                                                {otp_code}
-                                            </p>
-                                        </div>
-
-                                        <p style="margin: 0 0 15px 0; color: #666666; font-size: 14px; line-height: 1.6;">
-                                            This code will expire in <strong>10 minutes</strong>.
-                                        </p>
-                                        <p style="margin: 0; color: #999999; font-size: 12px; line-height: 1.6;">
-                                            If you didn't request this code, please ignore this email.
-                                        </p>
-                                    </td>
-                                </tr>
-
-                                <!-- Footer -->
-                                <tr>
-                                    <td style="background-color: #f8f9fa; padding: 30px; text-align: center; border-top: 1px solid #e0e0e0;">
-                                        <p style="margin: 0 0 10px 0; color: #999999; font-size: 12px;">
-                                            © 2025 VEOmenu. All rights reserved.
-                                        </p>
-                                        <p style="margin: 0; color: #999999; font-size: 12px;">
-                                            This email was sent to {user_email}
-                                        </p>
-                                    </td>
-                                </tr>
-                            </table>
-                        </td>
-                    </tr>
-                </table>
-            </body>
-            </html>
-            """
-
-            # Plain text fallback
-            plain_content = f"""
-            Hello {user_name}!
-
-            Your VEOmenu verification code is: {otp_code}
-
-            This code will expire in 10 minutes.
-
-            If you didn't request this code, please ignore this email.
-
-            © 2025 VEOmenu. All rights reserved.
-            """
-
-            # Create and send email
-            mail = Mail(
-                from_email=from_email,
-                to_emails=to_email,
-                subject=subject,
-                plain_text_content=plain_content,
-                html_content=html_content
+            otp_code = _fmt_otp(otp_code)
+
+            dedupe_key = ('otp_email', user_email, otp_code)
+            if _RECENT_SENDS.seen(dedupe_key):
+                return True, "OTP email already sent"
+
+            if not _SENDGRID_CB.allow():
+                return False, "Email provider unavailable"
+
+            # Render via the cached template loader
+            context = {
+                'user_name': user_name,
+                'user_email': user_email,
+                'otp_code': otp_code,
+            }
+            payload = _mail_payload(
+                user_email,
+                _OTP_SUBJECT,
+                _get_template('emails/otp.txt').render(context),
+                _minify_html(_get_template('emails/otp.html').render(context)),
             )
 
-            response = sg.send(mail)
-            logger.info(f"OTP email sent successfully to {user_email}. Status: {response.status_code}")
+            _SENDGRID_RL.acquire()
+            response = _sendgrid_session.post(
+                _SENDGRID_SEND_URL, json=payload, timeout=_HTTP_TIMEOUT
+            )
+            response.raise_for_status()
+            _SENDGRID_CB.record_success()
+            _RECENT_SENDS.add(dedupe_key)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("OTP email sent successfully to %s. Status: %s",
+                            user_email, response.status_code)
             return True, "OTP email sent successfully"
 
-        except Exception as e:
-            logger.error(f"Failed to send OTP email to {user_email}: {str(e)}")
-            return False, f"Failed to send email: {str(e)}"
+        except HTTPError as e:
+            _SENDGRID_CB.record_failure()
+            logger.error("Failed to send OTP email to %s: HTTP %s %s", user_email,
+                         e.response.status_code, e.response.reason)
+            return False, "Failed to send email"
+        except RequestException:
+            _SENDGRID_CB.record_failure()
+            logger.error("Failed to send OTP email to %s: network error", user_email)
+            return False, "Failed to send email"
+
+    @classmethod
+    def send_otp_email_async(cls, user_email, user_name, otp_code):
+        """Queue the OTP email on a Celery worker and return immediately."""
+        from .tasks import sendgrid_send_otp_email_task
+        sendgrid_send_otp_email_task.delay(user_email, user_name, otp_code)
+        return True, "OTP email queued"
+
+    @classmethod
+    def enqueue_otp_email(cls, user_email, user_name, otp_code):
+        """Queue the OTP email once the current transaction commits."""
+        from .tasks import sendgrid_send_otp_email_task
+        transaction.on_commit(
+            lambda: sendgrid_send_otp_email_task.delay(user_email, user_name, otp_code)
+        )
+        return True, "OTP email queued"
+
+    @classmethod
+    async def asend_otp_email(cls, user_email, user_name, otp_code):
+        """
+        Send the OTP email from async views without blocking the event loop.
+
+        Posts straight to SendGrid's REST API over the shared pooled client;
+        the semaphore caps in-flight sends to stay under the provider rate.
+        """
+        context = {
+            'user_name': user_name,
+            'user_email': user_email,
+            'otp_code': _fmt_otp(otp_code),
+        }
+        payload = _mail_payload(
+            user_email,
+            _OTP_SUBJECT,
+            _get_template('emails/otp.txt').render(context),
+            _minify_html(_get_template('emails/otp.html').render(context)),
+        )
+
+        if not _SENDGRID_CB.allow():
+            return False, "Email provider unavailable"
+
+        try:
+            async with _ASYNC_SEND_LIMIT:
+                response = await _async_http.post(
+                    _SENDGRID_SEND_URL,
+                    json=payload,
+                    headers=_SENDGRID_AUTH_HEADERS,
+                )
+            response.raise_for_status()
+            _SENDGRID_CB.record_success()
+        except httpx.HTTPStatusError as e:
+            _SENDGRID_CB.record_failure()
+            logger.error("Failed to send OTP email to %s: HTTP %s %s", user_email,
+                         e.response.status_code, e.response.reason_phrase)
+            return False, "Failed to send email"
+        except httpx.HTTPError:
+            _SENDGRID_CB.record_failure()
+            logger.error("Failed to send OTP email to %s: network error", user_email)
+            return False, "Failed to send email"
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("OTP email sent successfully to %s. Status: %s",
+                        user_email, response.status_code)
+        return True, "OTP email sent successfully"
+
+    @staticmethod
+    def send_otp_batch(recipients):
+        """
+        Send OTP emails to many recipients in as few requests as possible.
+
+        SendGrid's /mail/send accepts up to 1000 personalizations per call,
+        so a burst of N OTPs costs ceil(N / 1000) HTTPS round-trips instead
+        of N. The shared bodies are uploaded once per request with
+        per-recipient substitution tags.
+
+        Args:
+            recipients: iterable of (user_email, user_name, otp_code) tuples
+
+        Returns:
+            tuple: (success: bool, message: str)
+        """
+        recipients = list(recipients)
+        if not recipients:
+            return True, "No recipients"
+
+        if not _SENDGRID_CB.allow():
+            return False, "Email provider unavailable"
+
+        tags = {
+            'user_name': '-user_name-',
+            'user_email': '-user_email-',
+            'otp_code': '-otp_code-',
+        }
+        html_content = _minify_html(_get_template('emails/otp.html').render(tags))
+        plain_content = _get_template('emails/otp.txt').render(tags)
+
+        try:
+            for start in range(0, len(recipients), _SENDGRID_BATCH_LIMIT):
+                payload = {
+                    "personalizations": [
+                        {
+                            "to": [{"email": user_email}],
+                            "substitutions": {
+                                '-user_name-': user_name,
+                                '-user_email-': user_email,
+                                '-otp_code-': _fmt_otp(otp_code),
+                            },
+                        }
+                        for user_email, user_name, otp_code
+                        in recipients[start:start + _SENDGRID_BATCH_LIMIT]
+                    ],
+                    "from": _SENDGRID_FROM,
+                    "subject": _OTP_SUBJECT,
+                    "content": [
+                        {"type": "text/plain", "value": plain_content},
+                        {"type": "text/html", "value": html_content},
+                    ],
+                }
+
+                _SENDGRID_RL.acquire()
+                response = _sendgrid_session.post(
+                    _SENDGRID_SEND_URL, json=payload, timeout=_HTTP_TIMEOUT
+                )
+                response.raise_for_status()
+                _SENDGRID_CB.record_success()
+
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("OTP email batch sent to %s recipients", len(recipients))
+            return True, "OTP email batch sent successfully"
+
+        except HTTPError as e:
+            _SENDGRID_CB.record_failure()
+            logger.error("Failed to send OTP email batch: HTTP %s %s",
+                         e.response.status_code, e.response.reason)
+            return False, "Failed to send email batch"
+        except RequestException:
+            _SENDGRID_CB.record_failure()
+            logger.error("Failed to send OTP email batch: network error")
+            return False, "Failed to send email batch"
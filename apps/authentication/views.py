@@ -8,11 +8,13 @@ from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from django.utils import timezone
-from django.core.mail import send_mail
 from django.conf import settings
 from datetime import timedelta
-import secrets
+from functools import lru_cache
+import logging
+import re
 
 from .models import MagicLink, UserSession, PhoneVerification
 from .serializers import (
@@ -27,10 +29,60 @@ from .serializers import (
     PhoneVerificationConfirmSerializer,
     PhoneVerificationSerializer
 )
-from .services import PhoneService, EmailService
+from .services import get_phone_service
+from .tasks import (
+    record_user_session_task,
+    send_magic_link_email_task,
+    send_welcome_email_task,
+)
 
 User = get_user_model()
 
+logger = logging.getLogger(__name__)
+
+_MOBILE_UA_RE = re.compile(r'Mobile|iPhone|Android')
+
+# Lifetimes used on every auth request, built once instead of per call
+SESSION_TTL = timedelta(days=7)
+REGISTER_SESSION_TTL = timedelta(days=30)
+MAGIC_LINK_TTL = timedelta(minutes=15)
+PHONE_COOLDOWN = timedelta(minutes=10)
+
+
+@lru_cache(maxsize=4096)
+def classify_ua(user_agent):
+    """Classify a user agent as mobile or desktop; cached since clients
+    repeat the same UA string on every login."""
+    return 'mobile' if _MOBILE_UA_RE.search(user_agent) else 'desktop'
+
+
+def _user_payload(user, request):
+    """
+    Serialize the user block for auth responses, or None when the client
+    passes include_user=0 because it already holds the profile.
+
+    UserSerializer walks the instance memberships, so skipping it saves a
+    query plus the serialization pass on repeat logins.
+    """
+    if request.query_params.get('include_user') == '0':
+        return None
+    return UserSerializer(user).data
+
+
+def _issue_session(user, request, access_token, refresh_token):
+    """Queue the session audit-row insert for a freshly authenticated
+    request; the response doesn't wait on the write."""
+    user_agent = request.META.get('HTTP_USER_AGENT', 'Unknown')
+    ip_address = request.META.get('REMOTE_ADDR', '')
+    device_type = classify_ua(user_agent)
+    expires_at = timezone.now() + SESSION_TTL
+
+    # Enqueue after commit so the worker never races an uncommitted user row
+    transaction.on_commit(lambda: record_user_session_task.delay(
+        user.id, access_token, refresh_token, user_agent, device_type,
+        ip_address, expires_at.isoformat()
+    ))
+
 
 class AuthViewSet(viewsets.GenericViewSet):
     """
@@ -55,35 +107,30 @@ class AuthViewSet(viewsets.GenericViewSet):
         access_token = str(refresh.access_token)
         refresh_token = str(refresh)
 
-        # Create user session
-        UserSession.objects.create(
-            user=user,
-            token=access_token,
-            refresh_token=refresh_token,
-            expires_at=timezone.now() + timedelta(days=30),  # 30 days expiration
-            is_active=True
-        )
+        # The session audit row is inserted by a worker so registration
+        # doesn't wait on the write; enqueue after commit so the worker
+        # sees the just-created user row
+        expires_at = timezone.now() + REGISTER_SESSION_TTL
+        transaction.on_commit(lambda: record_user_session_task.delay(
+            user.id, access_token, refresh_token, '', '', None,
+            expires_at.isoformat()
+        ))
 
-        # Send welcome email
+        # Queue the welcome email; a delivery problem must not fail registration
         try:
-            print(f"Attempting to send welcome email to {user.email}")
-            email_service = EmailService()
-            welcome_result = email_service.send_welcome_email(user.email, user.name)
-            print(f"Welcome email result: {welcome_result}")
-            
-            # Log email result (don't fail registration if email fails)
-            if not welcome_result['success']:
-                print(f"Failed to send welcome email to {user.email}: {welcome_result.get('error', 'Unknown error')}")
-        except Exception as e:
-            print(f"Error in welcome email sending: {str(e)}")
-            # Don't fail registration for email issues
+            send_welcome_email_task.delay(user.email, user.name)
+        except Exception:
+            logger.exception("Failed to queue welcome email for %s", user.email)
 
-        return Response({
+        payload = {
             'message': 'Registration successful. You are now logged in.',
-            'user': UserSerializer(user).data,
             'access_token': access_token,
             'refresh_token': refresh_token
-        }, status=status.HTTP_201_CREATED)
+        }
+        user_data = _user_payload(user, request)
+        if user_data is not None:
+            payload['user'] = user_data
+        return Response(payload, status=status.HTTP_201_CREATED)
 
     @action(detail=False, methods=['post'], url_path='login')
     def login(self, request):
@@ -97,30 +144,22 @@ class AuthViewSet(viewsets.GenericViewSet):
 
         user = serializer.validated_data['user']
 
-        # Generate JWT tokens
+        # Generate JWT tokens once; each str() re-signs the token
         refresh = RefreshToken.for_user(user)
+        access_token = str(refresh.access_token)
+        refresh_token = str(refresh)
 
-        # Create user session
-        user_agent = request.META.get('HTTP_USER_AGENT', 'Unknown')
-        ip_address = request.META.get('REMOTE_ADDR', '')
-        device_type = 'mobile' if 'Mobile' in user_agent else 'desktop'
-
-        UserSession.objects.create(
-            user=user,
-            token=str(refresh.access_token),
-            refresh_token=str(refresh),
-            user_agent=user_agent,
-            device_type=device_type,
-            ip_address=ip_address,
-            expires_at=timezone.now() + timezone.timedelta(days=7)
-        )
+        _issue_session(user, request, access_token, refresh_token)
 
-        return Response({
+        payload = {
             'message': 'Login successful',
-            'access': str(refresh.access_token),
-            'refresh': str(refresh),
-            'user': UserSerializer(user).data
-        }, status=status.HTTP_200_OK)
+            'access': access_token,
+            'refresh': refresh_token
+        }
+        user_data = _user_payload(user, request)
+        if user_data is not None:
+            payload['user'] = user_data
+        return Response(payload, status=status.HTTP_200_OK)
 
     @action(detail=False, methods=['post'], url_path='request-magic-link')
     def request_magic_link(self, request):
@@ -133,29 +172,15 @@ class AuthViewSet(viewsets.GenericViewSet):
         serializer.is_valid(raise_exception=True)
 
         email = serializer.validated_data['email']
-        user = User.objects.get(email=email)
-
-        # Generate magic link token
-        token = secrets.token_urlsafe(32)
-        expires_at = timezone.now() + timezone.timedelta(minutes=15)
+        user = serializer.context['user']
 
-        # Create magic link
-        magic_link = MagicLink.objects.create(
-            user=user,
-            token=token,
-            expires_at=expires_at
-        )
-
-        # Send email with magic link
-        magic_url = f"{settings.FRONTEND_URL}/auth/verify?token={token}"
+        # Create magic link with a collision-safe single INSERT
+        expires_at = timezone.now() + MAGIC_LINK_TTL
+        magic_link = MagicLink.create_with_token(user, expires_at)
 
-        send_mail(
-            subject='Your VEOmenu Login Link',
-            message=f'Click here to log in: {magic_url}\n\nThis link expires in 15 minutes.',
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[email],
-            fail_silently=False,
-        )
+        # Queue the magic link email; the SMTP round-trip happens on a worker
+        magic_url = f"{settings.FRONTEND_URL}/auth/verify?token={magic_link.token_str}"
+        send_magic_link_email_task.delay(email, magic_url)
 
         return Response({
             'message': 'Magic link sent to your email. Please check your inbox.',
@@ -172,37 +197,38 @@ class AuthViewSet(viewsets.GenericViewSet):
         serializer = MagicLinkVerifySerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        token = serializer.validated_data['token']
-        magic_link = MagicLink.objects.get(token=token)
+        magic_link = serializer.context['magic_link']
 
-        # Mark magic link as used
-        magic_link.is_used = True
-        magic_link.save()
+        # Consume the token atomically: the conditional UPDATE wins for at
+        # most one request, closing the window where two concurrent clicks
+        # could both pass the serializer's validity check
+        consumed = MagicLink.objects.filter(
+            pk=magic_link.pk,
+            is_used=False,
+            expires_at__gt=timezone.now()
+        ).update(is_used=True, used_at=timezone.now())
+
+        if not consumed:
+            return Response({
+                'error': 'Invalid or expired token.'
+            }, status=status.HTTP_400_BAD_REQUEST)
 
-        # Generate JWT tokens
+        # Generate JWT tokens once; each str() re-signs the token
         refresh = RefreshToken.for_user(magic_link.user)
+        access_token = str(refresh.access_token)
+        refresh_token = str(refresh)
 
-        # Create user session
-        user_agent = request.META.get('HTTP_USER_AGENT', 'Unknown')
-        ip_address = request.META.get('REMOTE_ADDR', '')
-        device_type = 'mobile' if 'Mobile' in user_agent else 'desktop'
-
-        UserSession.objects.create(
-            user=magic_link.user,
-            token=str(refresh.access_token),
-            refresh_token=str(refresh),
-            user_agent=user_agent,
-            device_type=device_type,
-            ip_address=ip_address,
-            expires_at=timezone.now() + timezone.timedelta(days=7)
-        )
+        _issue_session(magic_link.user, request, access_token, refresh_token)
 
-        return Response({
+        payload = {
             'message': 'Login successful',
-            'access': str(refresh.access_token),
-            'refresh': str(refresh),
-            'user': UserSerializer(magic_link.user).data
-        }, status=status.HTTP_200_OK)
+            'access': access_token,
+            'refresh': refresh_token
+        }
+        user_data = _user_payload(magic_link.user, request)
+        if user_data is not None:
+            payload['user'] = user_data
+        return Response(payload, status=status.HTTP_200_OK)
 
     @action(detail=False, methods=['post'], url_path='logout', permission_classes=[IsAuthenticated])
     def logout(self, request):
@@ -211,11 +237,10 @@ class AuthViewSet(viewsets.GenericViewSet):
         POST /api/auth/logout/
         Headers: Authorization: Bearer <token>
         """
-        # Get authorization header
+        # Get authorization header; removeprefix strips the scheme in one pass
         auth_header = request.META.get('HTTP_AUTHORIZATION', '')
-        if auth_header.startswith('Bearer '):
-            token = auth_header[7:]
-
+        token = auth_header.removeprefix('Bearer ')
+        if token != auth_header:
             # Deactivate user session
             UserSession.objects.filter(
                 user=request.user,
@@ -237,7 +262,7 @@ class AuthViewSet(viewsets.GenericViewSet):
         serializer = PhoneVerificationRequestSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
-        phone_service = PhoneService()
+        phone_service = get_phone_service()
         result = phone_service.create_verification(request.user, serializer.validated_data['phone_number'])
         
         if result['success']:
@@ -263,7 +288,7 @@ class AuthViewSet(viewsets.GenericViewSet):
         serializer = PhoneVerificationConfirmSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
-        phone_service = PhoneService()
+        phone_service = get_phone_service()
         result = phone_service.verify_code_for_user(
             request.user,
             serializer.validated_data['verification_code']
@@ -285,54 +310,15 @@ class AuthViewSet(viewsets.GenericViewSet):
         Check phone verification cooldown status
         GET /api/auth/phone-verification-cooldown/
         """
-        from .services import PhoneService
         
-        phone_service = PhoneService()
-        cooldown_minutes = 10
-        
-        # Check for recent verification (single entry per user)
-        try:
-            verification = PhoneVerification.objects.get(user=request.user)
-            
-            # If code has expired, mark it as verified to prevent it from being considered active
-            if verification.expires_at < timezone.now() and not verification.is_verified:
-                print(f"[COOLDOWN DEBUG] Code has expired, marking as verified to prevent reuse")
-                verification.is_verified = True
-                verification.save()
-            
-            time_remaining = (verification.created_at + timedelta(minutes=cooldown_minutes) - timezone.now()).total_seconds()
-            
-            print(f"[COOLDOWN DEBUG] User: {request.user.id}")
-            print(f"[COOLDOWN DEBUG] Verification created_at: {verification.created_at}")
-            print(f"[COOLDOWN DEBUG] Current time: {timezone.now()}")
-            print(f"[COOLDOWN DEBUG] Time remaining: {time_remaining}")
-            print(f"[COOLDOWN DEBUG] Is verified: {verification.is_verified}")
-            print(f"[COOLDOWN DEBUG] Expires at: {verification.expires_at}")
-            print(f"[COOLDOWN DEBUG] Code expired: {verification.expires_at < timezone.now()}")
-            print(f"[COOLDOWN DEBUG] Has active code: {not verification.is_verified and verification.expires_at > timezone.now()}")
-            
-            if time_remaining > 0:
-                print(f"[COOLDOWN DEBUG] Returning cooldown active: {int(time_remaining)} seconds")
-                return Response({
-                    'cooldown_active': True,
-                    'cooldown_remaining': int(time_remaining),
-                    'can_send': False,
-                    'last_sent_at': verification.created_at,
-                    'has_active_code': not verification.is_verified and verification.expires_at > timezone.now()
-                }, status=status.HTTP_200_OK)
-            else:
-                # Cooldown expired but check if there's still an active code
-                has_active_code = not verification.is_verified and verification.expires_at > timezone.now()
-                print(f"[COOLDOWN DEBUG] Cooldown expired, has_active_code: {has_active_code}")
-                return Response({
-                    'cooldown_active': False,
-                    'cooldown_remaining': 0,
-                    'can_send': True,
-                    'last_sent_at': verification.created_at,
-                    'has_active_code': has_active_code
-                }, status=status.HTTP_200_OK)
-        except PhoneVerification.DoesNotExist:
-            print(f"[COOLDOWN DEBUG] No verification found for user: {request.user.id}")
+        # Check for recent verification (single entry per user); project to
+        # the three fields the response needs instead of the full row
+        verification = PhoneVerification.objects.filter(
+            user=request.user
+        ).values('created_at', 'expires_at', 'is_verified').first()
+
+        if verification is None:
+            logger.debug("No phone verification found for user %s", request.user.id)
             return Response({
                 'cooldown_active': False,
                 'cooldown_remaining': 0,
@@ -341,6 +327,39 @@ class AuthViewSet(viewsets.GenericViewSet):
                 'has_active_code': False
             }, status=status.HTTP_200_OK)
 
+        # Expired codes are flipped in bulk by the expire_phone_verifications
+        # beat task, so this endpoint stays read-only; has_active_code below
+        # already treats expired codes as inactive.
+        now = timezone.now()
+        time_remaining = (verification['created_at'] + PHONE_COOLDOWN - now).total_seconds()
+        has_active_code = not verification['is_verified'] and verification['expires_at'] > now
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Cooldown check for user %s: created_at=%s time_remaining=%s "
+                "is_verified=%s expires_at=%s",
+                request.user.id, verification['created_at'], time_remaining,
+                verification['is_verified'], verification['expires_at'],
+            )
+
+        if time_remaining > 0:
+            return Response({
+                'cooldown_active': True,
+                'cooldown_remaining': int(time_remaining),
+                'can_send': False,
+                'last_sent_at': verification['created_at'],
+                'has_active_code': has_active_code
+            }, status=status.HTTP_200_OK)
+
+        # Cooldown expired but report whether there's still an active code
+        return Response({
+            'cooldown_active': False,
+            'cooldown_remaining': 0,
+            'can_send': True,
+            'last_sent_at': verification['created_at'],
+            'has_active_code': has_active_code
+        }, status=status.HTTP_200_OK)
+
 
 class UserViewSet(viewsets.ReadOnlyModelViewSet):
     """
@@ -351,6 +370,19 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
 
+    def get_queryset(self):
+        """Prefetch active memberships so UserSerializer avoids per-user queries"""
+        from django.db.models import Prefetch
+        from apps.instances.models import InstanceMember
+
+        return User.objects.prefetch_related(
+            Prefetch(
+                'instance_memberships',
+                queryset=InstanceMember.objects.filter(is_active=True).select_related('instance'),
+                to_attr='_active_memberships'
+            )
+        )
+
     @action(detail=False, methods=['get'], url_path='me')
     def me(self, request):
         """
@@ -386,9 +418,17 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
         Get all active sessions for current user
         GET /api/users/sessions/
         """
+        # Project to just the serialized columns; in particular this skips
+        # loading the full User row (password hash, permission flags, ...)
+        # for the nested brief payload
         sessions = UserSession.objects.filter(
             user=request.user,
             is_active=True
+        ).select_related('user').only(
+            'id', 'token', 'refresh_token', 'ip_address', 'user_agent',
+            'device_type', 'location', 'is_active', 'created_at',
+            'last_activity', 'expires_at',
+            'user__id', 'user__email', 'user__name', 'user__avatar',
         ).order_by('-last_activity')
 
         serializer = UserSessionSerializer(sessions, many=True)
@@ -408,20 +448,20 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
                 'error': 'session_id is required'
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        session = UserSession.objects.filter(
+        # Deactivate with a direct UPDATE instead of hydrating and
+        # re-saving the full instance; the row count doubles as the
+        # existence check
+        revoked = UserSession.objects.filter(
             id=session_id,
             user=request.user,
             is_active=True
-        ).first()
+        ).update(is_active=False)
 
-        if not session:
+        if not revoked:
             return Response({
                 'error': 'Session not found or already revoked'
             }, status=status.HTTP_404_NOT_FOUND)
 
-        session.is_active = False
-        session.save()
-
         return Response({
             'message': 'Session revoked successfully'
         }, status=status.HTTP_200_OK)
@@ -8,6 +8,12 @@ class InstanceMemberInline(admin.TabularInline):
     extra = 0
     fields = ['user', 'role', 'is_active', 'joined_at']
     readonly_fields = ['joined_at']
+    # Widget renders as a raw id instead of a select over every user, and
+    # the rows join their users up front instead of one query per row
+    raw_id_fields = ['user']
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('user')
 
 
 class BusinessHoursInline(admin.TabularInline):
@@ -66,11 +72,42 @@ class InstanceAdmin(admin.ModelAdmin):
     logo_preview.short_description = 'Logo Preview'
 
     def save_model(self, request, obj, form, change):
-        # Ensure only one instance is marked as demo
-        if obj.is_demo:
-            # Unmark all other demo instances
+        # Ensure only one instance is marked as demo. The partial unique
+        # constraint enforces this at the DB level; the un-flagging UPDATE
+        # only runs when the demo flag was actually switched on, so the
+        # common save path skips it entirely
+        if obj.is_demo and (not change or 'is_demo' in form.changed_data):
             Instance.objects.filter(is_demo=True).exclude(pk=obj.pk).update(is_demo=False)
-        super().save_model(request, obj, form, change)
+
+        if change and form.changed_data:
+            # Edits write only the touched columns instead of the full
+            # 30-column row; updated_at is auto_now so it must be listed
+            obj.save(update_fields=list(form.changed_data) + ['updated_at'])
+        else:
+            super().save_model(request, obj, form, change)
+
+    def save_formset(self, request, form, formset, change):
+        # Batch the member/hours inlines: one INSERT for all added rows and
+        # one UPDATE per batch for edited rows, instead of a query per row
+        rows = formset.save(commit=False)
+        for obj in formset.deleted_objects:
+            obj.delete()
+
+        added = [obj for obj in rows if obj.pk is None]
+        edited = [obj for obj in rows if obj.pk is not None]
+
+        model = formset.model
+        if added:
+            model.objects.bulk_create(added, batch_size=500)
+        if edited:
+            fields = [
+                f.name for f in model._meta.concrete_fields
+                if not f.primary_key
+                and not getattr(f, 'auto_now', False)
+                and not getattr(f, 'auto_now_add', False)
+            ]
+            model.objects.bulk_update(edited, fields, batch_size=500)
+        formset.save_m2m()
 
 
 @admin.register(InstanceMember)
@@ -79,6 +116,7 @@ class InstanceMemberAdmin(admin.ModelAdmin):
     list_filter = ['role', 'is_active', 'joined_at']
     search_fields = ['user__email', 'instance__name']
     ordering = ['-joined_at']
+    list_select_related = ['user', 'instance']
 
 
 @admin.register(BusinessHours)
@@ -87,3 +125,4 @@ class BusinessHoursAdmin(admin.ModelAdmin):
     list_filter = ['day_of_week', 'is_closed']
     search_fields = ['instance__name']
     ordering = ['instance', 'day_of_week']
+    list_select_related = ['instance']
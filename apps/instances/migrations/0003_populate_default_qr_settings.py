@@ -3,46 +3,68 @@
 from django.db import migrations
 
 
+QR_FIELDS = [
+    'qr_foreground_color', 'qr_size', 'qr_margin',
+    'qr_error_correction_level', 'qr_selected_menu_id',
+]
+
+BATCH_SIZE = 5000
+
+
 def populate_qr_defaults(apps, schema_editor):
     """
-    Populate default QR code settings for all instances that don't have them set
+    Populate default QR code settings for all instances that don't have them
+    set, batching the writes with bulk_update instead of one UPDATE per row.
     """
     Instance = apps.get_model('instances', 'Instance')
-    
-    for instance in Instance.objects.all():
+    Menu = apps.get_model('menus', 'Menu')
+
+    # One query for all default menus; setdefault keeps the first active
+    # menu per instance, matching the old per-instance .first() lookup
+    menu_by_instance = {}
+    for row in Menu.objects.filter(is_active=True).order_by('instance_id', 'id').values('instance_id', 'id'):
+        menu_by_instance.setdefault(row['instance_id'], row['id'])
+
+    to_update = []
+    qs = Instance.objects.only('id', *QR_FIELDS).iterator(chunk_size=BATCH_SIZE)
+    for instance in qs:
         updated = False
-        
+
         # Set default QR foreground color if not set
-        if not instance.qr_foreground_color or instance.qr_foreground_color == '':
+        if not instance.qr_foreground_color:
             instance.qr_foreground_color = '#000000'
             updated = True
-        
+
         # Set default QR size if not set or zero
-        if not instance.qr_size or instance.qr_size == 0:
+        if not instance.qr_size:
             instance.qr_size = 400
             updated = True
-        
+
         # Set default QR margin if not set
-        if instance.qr_margin is None or instance.qr_margin == 0:
+        if not instance.qr_margin:
             instance.qr_margin = 4
             updated = True
-        
+
         # Set default error correction level if not set
-        if not instance.qr_error_correction_level or instance.qr_error_correction_level == '':
+        if not instance.qr_error_correction_level:
             instance.qr_error_correction_level = 'M'
             updated = True
-        
-        # Set selected menu to first menu if not set
+
+        # Set selected menu to first active menu if not set
         if not instance.qr_selected_menu_id:
-            Menu = apps.get_model('menus', 'Menu')
-            first_menu = Menu.objects.filter(instance=instance, is_active=True).first()
-            if first_menu:
-                instance.qr_selected_menu_id = first_menu.id
+            menu_id = menu_by_instance.get(instance.id)
+            if menu_id:
+                instance.qr_selected_menu_id = menu_id
                 updated = True
-        
+
         if updated:
-            instance.save()
-            print(f"✓ Populated QR defaults for instance: {instance.name}")
+            to_update.append(instance)
+            if len(to_update) >= BATCH_SIZE:
+                Instance.objects.bulk_update(to_update, QR_FIELDS)
+                to_update = []
+
+    if to_update:
+        Instance.objects.bulk_update(to_update, QR_FIELDS)
 
 
 def reverse_func(apps, schema_editor):
@@ -0,0 +1,44 @@
+# Generated manually - Trigram indexes for admin search columns
+
+from django.db import migrations
+
+# Columns the InstanceAdmin changelist searches with icontains (ILIKE '%term%')
+SEARCH_COLUMNS = ('name', 'city', 'email', 'slug')
+
+
+def add_trigram_indexes(apps, schema_editor):
+    """
+    Create pg_trgm GIN indexes so admin ILIKE '%term%' searches use an
+    index scan instead of a sequential scan.
+
+    Only applies on PostgreSQL; other backends (the sqlite dev default)
+    have no trigram support and are left untouched.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for column in SEARCH_COLUMNS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS instances_{column}_trgm '
+            f'ON instances USING gin ({column} gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    for column in SEARCH_COLUMNS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS instances_{column}_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('instances', '0004_instance_is_demo'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-08-31 03:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('instances', '0005_instance_trigram_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='instance',
+            index=models.Index(fields=['-created_at'], name='instances_created_64ee50_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='instance',
+            index=models.Index(fields=['subscription_status', '-created_at'], name='instances_subscri_6b71ee_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='instance',
+            index=models.Index(fields=['is_active', 'is_demo'], name='instances_is_acti_0d1c45_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='instance',
+            index=models.Index(fields=['country', 'city'], name='instances_country_ded3a9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='instancemember',
+            index=models.Index(fields=['user', 'is_active'], name='instance_me_user_id_5fcdcf_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-08-31 03:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('instances', '0006_instance_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='instance',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_demo', True)), fields=('is_demo',), name='instances_single_demo'),
+        ),
+    ]
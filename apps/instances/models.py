@@ -1,7 +1,10 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.utils.functional import cached_property
 from django.utils import timezone
 from django.utils.text import slugify
 from apps.authentication.models import User
+import re
+import secrets
 import uuid
 
 
@@ -89,6 +92,22 @@ class Instance(models.Model):
         verbose_name = 'Instance'
         verbose_name_plural = 'Instances'
         ordering = ['-created_at']
+        indexes = [
+            # Default ordering plus the admin/dashboard filter shapes
+            models.Index(fields=['-created_at']),
+            models.Index(fields=['subscription_status', '-created_at']),
+            models.Index(fields=['is_active', 'is_demo']),
+            models.Index(fields=['country', 'city']),
+        ]
+        constraints = [
+            # At most one instance may be flagged as the landing-page demo;
+            # enforced by the DB instead of an un-flagging sweep per save
+            models.UniqueConstraint(
+                fields=['is_demo'],
+                condition=models.Q(is_demo=True),
+                name='instances_single_demo',
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -96,15 +115,38 @@ class Instance(models.Model):
     def save(self, *args, **kwargs):
         if not self.slug:
             base_slug = slugify(self.name)
-            slug = base_slug
-            counter = 1
-
-            # Handle slug collisions by appending a number
-            while Instance.objects.filter(slug=slug).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-
-            self.slug = slug
+            # One query fetches every slug in the base/base-N family; the
+            # next free counter is computed in Python instead of probing
+            # the table once per collision
+            existing = set(Instance.objects.filter(
+                slug__regex=rf'^{re.escape(base_slug)}(-[0-9]+)?$'
+            ).values_list('slug', flat=True))
+
+            if base_slug not in existing:
+                self.slug = base_slug
+            else:
+                taken = [
+                    int(s[len(base_slug) + 1:])
+                    for s in existing if s != base_slug
+                ]
+                self.slug = f"{base_slug}-{max(taken, default=0) + 1}"
+
+            try:
+                # Savepoint so a failed INSERT inside a caller's atomic()
+                # block (e.g. InstanceCreateSerializer.create) can be
+                # rolled back and retried; without it PostgreSQL rejects
+                # every statement after the IntegrityError
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+            except IntegrityError as e:
+                # Concurrent create grabbed the same slug between our
+                # SELECT and INSERT; a random suffix sidesteps the race.
+                # Other integrity failures propagate untouched.
+                if 'slug' not in str(e):
+                    raise
+                self.slug = f"{base_slug}-{secrets.token_hex(3)}"
+                super().save(*args, **kwargs)
+            return
         super().save(*args, **kwargs)
 
     def is_trial_active(self):
@@ -115,9 +157,19 @@ class Instance(models.Model):
             return False
         return timezone.now() < self.trial_end_date
 
+    @cached_property
+    def member_count(self):
+        """Number of active members, counted at most once per instance."""
+        # List/detail views annotate member_count, which lands in __dict__
+        # and shadows this; the COUNT only runs for instances loaded
+        # outside those querysets
+        return self.members.filter(is_active=True).count()
+
     def days_remaining_in_trial(self):
         """Calculate days remaining in trial."""
-        if not self.is_trial_active():
+        # Inlines the is_trial_active checks against one now() snapshot so
+        # list serialization pays a single timezone lookup per instance
+        if self.subscription_status != 'trial' or not self.trial_end_date:
             return 0
         delta = self.trial_end_date - timezone.now()
         return max(0, delta.days)
@@ -149,9 +201,15 @@ class InstanceMember(models.Model):
         verbose_name_plural = 'Instance Members'
         unique_together = ('instance', 'user')
         ordering = ['-joined_at']
+        indexes = [
+            # Serves the members__user membership joins and role lookups
+            models.Index(fields=['user', 'is_active']),
+        ]
 
     def __str__(self):
-        return f"{self.user.email} - {self.instance.name} ({self.role})"
+        # Built from local columns only: repr'ing querysets (admin, debug
+        # pages, tracebacks) must not trigger per-row FK SELECTs
+        return f"member user={self.user_id} instance={self.instance_id} ({self.role})"
 
     def is_owner(self):
         return self.role == 'owner'
@@ -176,6 +234,10 @@ class BusinessHours(models.Model):
         (6, 'Sunday'),
     ]
 
+    # Day names keyed once at class definition; __str__ runs per row on
+    # admin pages, so it shouldn't rebuild this dict each call
+    DAY_NAMES = dict(DAY_CHOICES)
+
     instance = models.ForeignKey(Instance, on_delete=models.CASCADE, related_name='business_hours')
     day_of_week = models.IntegerField(choices=DAY_CHOICES)
     opening_time = models.TimeField()
@@ -190,7 +252,8 @@ class BusinessHours(models.Model):
         ordering = ['day_of_week']
 
     def __str__(self):
-        day_name = dict(self.DAY_CHOICES)[self.day_of_week]
+        # Local columns only, same reasoning as InstanceMember.__str__
+        day_name = self.DAY_NAMES[self.day_of_week]
         if self.is_closed:
-            return f"{self.instance.name} - {day_name}: Closed"
-        return f"{self.instance.name} - {day_name}: {self.opening_time} - {self.closing_time}"
+            return f"{self.instance_id} - {day_name}: Closed"
+        return f"{self.instance_id} - {day_name}: {self.opening_time} - {self.closing_time}"
@@ -2,12 +2,17 @@
 Instances app serializers
 Handles restaurant/bar instances, members, and business hours
 """
+import logging
+
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from .models import Instance, InstanceMember, BusinessHours
 
 User = get_user_model()
 
+logger = logging.getLogger(__name__)
+
 
 class BusinessHoursSerializer(serializers.ModelSerializer):
     """
@@ -27,7 +32,9 @@ class InstanceSerializer(serializers.ModelSerializer):
     Full instance serializer with all details
     """
     business_hours = BusinessHoursSerializer(many=True, read_only=True)
-    member_count = serializers.SerializerMethodField()
+    # Read from the queryset annotation (one GROUP BY) instead of issuing
+    # a COUNT per serialized instance
+    member_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Instance
@@ -48,16 +55,13 @@ class InstanceSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'slug', 'created_at', 'updated_at', 'google_rating', 'google_review_count']
 
-    def get_member_count(self, obj):
-        """Get total number of members in this instance"""
-        return obj.members.count()
 
 
 class InstanceListSerializer(serializers.ModelSerializer):
     """
     Lightweight instance serializer for list views
     """
-    member_count = serializers.SerializerMethodField()
+    member_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Instance
@@ -67,10 +71,6 @@ class InstanceListSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'slug', 'created_at']
 
-    def get_member_count(self, obj):
-        """Get total number of members"""
-        return obj.members.count()
-
 
 class InstanceCreateSerializer(serializers.ModelSerializer):
     """
@@ -90,28 +90,57 @@ class InstanceCreateSerializer(serializers.ModelSerializer):
         """
         try:
             user = self.context['request'].user
-            print(f"Creating instance with data: {validated_data}")
-            print(f"User: {user}")
-
-            instance = Instance.objects.create(**validated_data)
-            print(f"Instance created: {instance.id}")
-
-            # Create owner membership
-            InstanceMember.objects.create(
-                instance=instance,
-                user=user,
-                role='owner',
-                is_active=True
-            )
-            print(f"Owner membership created")
+
+            # One transaction covers both inserts so a failed membership
+            # write can't leave an ownerless instance behind
+            with transaction.atomic():
+                instance = Instance.objects.create(**validated_data)
+                InstanceMember.objects.create(
+                    instance=instance,
+                    user=user,
+                    role='owner',
+                    is_active=True
+                )
 
             return instance
-        except Exception as e:
-            print(f"ERROR creating instance: {str(e)}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Error creating instance for %s", self.context['request'].user)
             raise
 
+    @classmethod
+    def bulk_create_for_user(cls, user, rows):
+        """
+        Create many instances owned by user in two batched INSERTs.
+
+        Args:
+            rows: iterable of validated field dicts (as accepted by create)
+
+        Intended for import flows; one bulk_create per table instead of a
+        transaction and two INSERTs per instance. bulk_create bypasses
+        Instance.save, so unique slugs are assigned here in one pass
+        against a single snapshot of existing slugs.
+        """
+        import secrets
+        from django.utils.text import slugify
+
+        instances = [Instance(**row) for row in rows]
+        taken = set(Instance.objects.values_list('slug', flat=True))
+        for instance in instances:
+            if not instance.slug:
+                slug = slugify(instance.name)
+                while slug in taken:
+                    slug = f"{slugify(instance.name)}-{secrets.token_hex(3)}"
+                instance.slug = slug
+            taken.add(instance.slug)
+
+        with transaction.atomic():
+            Instance.objects.bulk_create(instances, batch_size=1000)
+            InstanceMember.objects.bulk_create([
+                InstanceMember(instance=i, user=user, role='owner', is_active=True)
+                for i in instances
+            ], batch_size=1000)
+        return instances
+
 
 class InstanceMemberSerializer(serializers.ModelSerializer):
     """
@@ -139,8 +168,9 @@ class InstanceMemberInviteSerializer(serializers.Serializer):
     role = serializers.ChoiceField(choices=['admin', 'manager', 'staff'])
 
     def validate_email(self, value):
-        """Ensure user exists"""
-        if not User.objects.filter(email=value.lower()).exists():
+        """Ensure user exists; keep the row so validate/the view reuse it"""
+        self._user = User.objects.filter(email=value.lower()).first()
+        if self._user is None:
             raise serializers.ValidationError(
                 "No user found with this email. They must register first."
             )
@@ -149,10 +179,8 @@ class InstanceMemberInviteSerializer(serializers.Serializer):
     def validate(self, data):
         """Ensure user is not already a member"""
         instance = self.context.get('instance')
-        email = data.get('email')
 
-        user = User.objects.get(email=email)
-        if InstanceMember.objects.filter(instance=instance, user=user).exists():
+        if InstanceMember.objects.filter(instance=instance, user_id=self._user.id).exists():
             raise serializers.ValidationError("This user is already a member of this instance.")
 
         return data
@@ -175,8 +203,9 @@ class InstanceUpdateSerializer(serializers.ModelSerializer):
         ]
 
     def update(self, instance, validated_data):
-        """Update instance details"""
+        """Update instance details, writing only the submitted columns"""
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save()
+        # updated_at is auto_now and must be listed for Django to set it
+        instance.save(update_fields=list(validated_data) + ['updated_at'])
         return instance
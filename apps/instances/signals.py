@@ -1,12 +1,16 @@
 """
 Signals for instances app
 """
+import logging
+
 from django.db.models.signals import post_save, pre_delete
 from django.dispatch import receiver
 from apps.menus.models import Menu
 from apps.authentication.models import User
 from apps.instances.models import Instance
 
+logger = logging.getLogger(__name__)
+
 
 @receiver(post_save, sender=Menu)
 def set_default_qr_menu(sender, instance, created, **kwargs):
@@ -14,14 +18,18 @@ def set_default_qr_menu(sender, instance, created, **kwargs):
     When a new menu is created for an instance that has no QR menu selected,
     automatically set this menu as the QR menu
     """
-    if created and instance.instance:
-        restaurant_instance = instance.instance
-        
-        # If instance doesn't have a QR menu selected, set this one
-        if not restaurant_instance.qr_selected_menu_id:
-            restaurant_instance.qr_selected_menu_id = instance.id
-            restaurant_instance.save(update_fields=['qr_selected_menu_id'])
-            print(f"✓ Auto-selected menu '{instance.name}' for QR code in instance '{restaurant_instance.name}'")
+    if created and instance.instance_id:
+        # Conditional UPDATE keyed on the FK id: no Instance SELECT, no
+        # Instance save signals, and atomic when menus are created
+        # concurrently -- only the first one claims the unset column
+        updated = Instance.objects.filter(
+            pk=instance.instance_id,
+            qr_selected_menu_id__isnull=True,
+        ).update(qr_selected_menu_id=instance.id)
+
+        if updated:
+            logger.info("Auto-selected menu '%s' for QR code in instance %s",
+                        instance.name, instance.instance_id)
 
 
 @receiver(pre_delete, sender=User)
@@ -34,11 +42,15 @@ def delete_user_instances(sender, instance, **kwargs):
     owned_instances = Instance.objects.filter(
         members__user=instance,
         members__role='owner'
-    ).distinct()
-    
-    # Delete all owned instances (this will cascade delete menus, etc.)
-    for instance_obj in owned_instances:
-        instance_obj.delete()
-        print(f"✓ Deleted instance '{instance_obj.name}' owned by user '{instance.email}'")
-
+    )
 
+    # One queryset delete runs a single cascade walk with batched DELETEs
+    # instead of collecting and deleting each instance separately. Django
+    # refuses delete() on a distinct() queryset, so dedupe the membership
+    # join through a pk subquery instead
+    deleted_count, _ = Instance.objects.filter(
+        pk__in=owned_instances.values('pk')
+    ).delete()
+    if deleted_count:
+        logger.info("Deleted %d objects cascading from instances owned by %s",
+                    deleted_count, instance.email)
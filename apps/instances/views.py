@@ -7,6 +7,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.contrib.auth import get_user_model
+from django.db.models import Count, IntegerField, OuterRef, Subquery
 from django.shortcuts import get_object_or_404
 
 from .models import Instance, InstanceMember, BusinessHours
@@ -33,10 +34,41 @@ class InstanceViewSet(viewsets.ModelViewSet):
         """
         Get instances where the user is a member
         """
-        return Instance.objects.filter(
+        # Serializers read this instead of counting members per row. A
+        # correlated subquery keeps the count independent of the membership
+        # filter below, which constrains the join to the requesting user's
+        # own row; an explicit order_by is needed because Meta.ordering is
+        # not applied once the queryset carries an annotation join
+        member_count = (
+            InstanceMember.objects
+            .filter(instance=OuterRef('pk'), is_active=True)
+            .order_by()
+            .values('instance')
+            .annotate(n=Count('pk'))
+            .values('n')
+        )
+
+        queryset = Instance.objects.filter(
             members__user=self.request.user,
             members__is_active=True
-        ).distinct()
+        ).annotate(
+            member_count=Subquery(member_count, output_field=IntegerField())
+        ).distinct().order_by('-created_at')
+
+        if self.action == 'list':
+            # The list serializer renders a handful of columns; skip the
+            # TEXT/settings fields so rows stay narrow. Every serialized
+            # field is listed to keep deferred-column re-fetches impossible.
+            queryset = queryset.only(
+                'id', 'name', 'slug', 'logo', 'city', 'country',
+                'subscription_status', 'created_at',
+            )
+        else:
+            # The list serializer doesn't include hours, so only
+            # detail-style actions pay for the prefetch (one extra query
+            # instead of one per serialized instance)
+            queryset = queryset.prefetch_related('business_hours')
+        return queryset
 
     def get_serializer_class(self):
         """Return appropriate serializer based on action"""
@@ -56,6 +88,8 @@ class InstanceViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(data=request.data, context={'request': request})
         serializer.is_valid(raise_exception=True)
         instance = serializer.save()
+        # Freshly created instance only has its owner membership
+        instance.member_count = 1
 
         return Response({
             'message': 'Instance created successfully',
@@ -136,7 +170,11 @@ class InstanceViewSet(viewsets.ModelViewSet):
                 'error': 'You do not have permission to view members'
             }, status=status.HTTP_403_FORBIDDEN)
 
-        members = InstanceMember.objects.filter(instance=instance, is_active=True)
+        # The member serializer renders user email/name and the instance
+        # name; join them up front instead of two queries per member
+        members = InstanceMember.objects.filter(
+            instance=instance, is_active=True
+        ).select_related('user', 'instance')
         serializer = InstanceMemberSerializer(members, many=True)
         return Response(serializer.data)
 
@@ -170,7 +208,8 @@ class InstanceViewSet(viewsets.ModelViewSet):
         email = serializer.validated_data['email']
         role = serializer.validated_data['role']
 
-        user = User.objects.get(email=email)
+        # The serializer already fetched the invitee during validation
+        user = serializer._user
 
         # Create membership
         new_member = InstanceMember.objects.create(
@@ -303,7 +342,9 @@ class InstanceMemberViewSet(viewsets.ReadOnlyModelViewSet):
             members__is_active=True
         )
 
+        # select_related folds the user/instance columns the serializer
+        # reads into the main query, avoiding two lookups per member
         return InstanceMember.objects.filter(
             instance__in=user_instances,
             is_active=True
-        )
+        ).select_related('user', 'instance')
@@ -0,0 +1,15 @@
+"""
+Celery application for VEOmenu backend.
+
+Workers are started with:
+    celery -A veo_menu_backend worker -l info
+"""
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'veo_menu_backend.settings')
+
+app = Celery('veo_menu_backend')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
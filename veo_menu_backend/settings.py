@@ -83,8 +83,15 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Cached loader keeps parsed templates in memory so email bodies
+            # are compiled once per process instead of on every send
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -236,6 +243,22 @@ SPECTACULAR_SETTINGS = {
     'SERVE_INCLUDE_SCHEMA': False,
 }
 
+# Logging: app loggers emit DEBUG only when DEBUG=True, so hot-path
+# logger.debug calls are no-ops in production
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'apps': {
+            'handlers': ['console'],
+            'level': 'DEBUG' if DEBUG else 'INFO',
+        },
+    },
+}
+
 # Custom User Model
 AUTH_USER_MODEL = 'authentication.User'
 
@@ -248,4 +271,33 @@ TWILIO_AUTH_TOKEN = config('TWILIO_AUTH_TOKEN')
 TWILIO_PHONE_NUMBER = config('TWILIO_PHONE_NUMBER')
 
 # SendGrid Settings
-SENDGRID_API_KEY = config('SENDGRID_API_KEY', default='')
\ No newline at end of file
+SENDGRID_API_KEY = config('SENDGRID_API_KEY', default='')
+# Celery Settings (background tasks: outbound email/SMS)
+CELERY_BROKER_URL = get_env('CELERY_BROKER_URL', 'redis://localhost:6379/0')
+CELERY_RESULT_BACKEND = get_env('CELERY_RESULT_BACKEND', CELERY_BROKER_URL)
+CELERY_TASK_ALWAYS_EAGER = get_env('CELERY_TASK_ALWAYS_EAGER', DEBUG, cast=bool)
+CELERY_TASK_SERIALIZER = 'json'
+CELERY_ACCEPT_CONTENT = ['json']
+
+# Periodic maintenance: flip expired auth rows in bulk so request handlers
+# never pay those writes
+CELERY_BEAT_SCHEDULE = {
+    'expire-phone-verifications': {
+        'task': 'apps.authentication.tasks.expire_phone_verifications',
+        'schedule': 60.0,
+    },
+    'expire-magic-links': {
+        'task': 'apps.authentication.tasks.expire_magic_links',
+        'schedule': 60.0,
+    },
+}
+
+# Cache (Redis when configured, in-process memory otherwise)
+REDIS_CACHE_URL = get_env('REDIS_CACHE_URL', '')
+if REDIS_CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_CACHE_URL,
+        }
+    }